@@ -0,0 +1,99 @@
+from functools import cached_property
+
+from log_store import StudentLogStore
+from temporal import learning_curve, session_grid, temporal_features
+
+class AggregateCache:
+    # Dashboard aggregates for one version of (logs_df, metrics_df). Each one is computed
+    # on first use and then served from memory; build a new cache when the data changes.
+    def __init__(self, logs_df, metrics_df, version=0, temporal_window=3, forgetting_drop=0.15):
+        self.logs_df = logs_df
+        self.metrics_df = metrics_df
+        self.version = version
+        self.temporal_window = temporal_window
+        self.forgetting_drop = forgetting_drop
+        self._student_trends = {}
+        self._student_mistakes = {}
+        self._student_curves = {}
+
+    @cached_property
+    def kpis(self):
+        m = self.metrics_df
+        return {
+            'avg_accuracy': m['accuracy'].mean(),
+            'avg_response_time': m['avg_response_time'].mean(),
+            'top_pattern': m['pattern'].mode()[0],
+            'avg_retention': m['retention'].mean()
+        }
+
+    @cached_property
+    def funnel_counts(self):
+        acc = self.metrics_df['accuracy']
+        return {'proficient': int((acc > 0.75).sum()), 'mastery': int((acc > 0.9).sum())}
+
+    @cached_property
+    def pattern_counts(self):
+        return self.metrics_df['pattern'].value_counts().rename_axis('pattern').reset_index(name='count')
+
+    @cached_property
+    def session_trend(self):
+        return self.logs_df.groupby('session')['score'].mean().reset_index()
+
+    @cached_property
+    def pattern_trajectory(self):
+        patterns = self.metrics_df[['student_id', 'pattern']]
+        merged = self.logs_df[['student_id', 'session', 'score']].merge(patterns, on='student_id')
+        return merged.groupby(['pattern', 'session'])['score'].mean().reset_index()
+
+    @cached_property
+    def pattern_means(self):
+        norm_cols = [c for c in self.metrics_df.columns if c.endswith('_norm')]
+        return self.metrics_df.groupby('pattern')[norm_cols].mean().reset_index()
+
+    @cached_property
+    def session_grid(self):
+        # Shared by the temporal features and the learning curves
+        return session_grid(self.logs_df)
+
+    @cached_property
+    def temporal(self):
+        # Temporal features of every student, indexed by student_id
+        features = temporal_features(self.logs_df, self.temporal_window, self.forgetting_drop, grid=self.session_grid)
+        return features.set_index('student_id')
+
+    @cached_property
+    def log_store(self):
+        return StudentLogStore(self.logs_df)
+
+    @cached_property
+    def metrics_positions(self):
+        return {sid: i for i, sid in enumerate(self.metrics_df['student_id'])}
+
+    def student_row(self, student_id):
+        return self.metrics_df.iloc[self.metrics_positions[student_id]]
+
+    # Per-student aggregates come from the student's slice of the log store and are kept
+    # per student, so a drill-down never touches other students' rows
+    def student_trend(self, student_id):
+        if student_id not in self._student_trends:
+            s_logs = self.log_store.get(student_id)
+            self._student_trends[student_id] = s_logs.groupby('session', observed=True).agg(
+                {'score': 'mean', 'response_time': 'mean'}
+            ).reset_index()
+        return self._student_trends[student_id]
+
+    def student_mistakes(self, student_id):
+        if student_id not in self._student_mistakes:
+            s_logs = self.log_store.get(student_id)
+            self._student_mistakes[student_id] = s_logs[s_logs['correct'] == 0].groupby(
+                'subject', observed=True
+            ).size().reset_index(name='count')
+        return self._student_mistakes[student_id]
+
+    def student_temporal(self, student_id):
+        return self.temporal.loc[student_id]
+
+    def student_learning_curve(self, student_id):
+        if student_id not in self._student_curves:
+            self._student_curves[student_id] = learning_curve(self.session_grid, student_id, self.temporal_window)
+        return self._student_curves[student_id]
@@ -1,9 +1,12 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
+
+from classifier import NearestProfileClassifier
+from instrumentation import timed
+from temporal import temporal_features
 
 class CognitiveAnalyzer:
-    def __init__(self):
+    def __init__(self, distance_metric="euclidean", feature_weights=None):
         # 5 patterns using normalized metrics [0-1]
         # Metrics: [accuracy, avg_response_time, retry_rate, mistake_freq, retention_score]
         # To make it simpler, we just use the 4 extracted + retention
@@ -19,70 +22,234 @@ class CognitiveAnalyzer:
             "Social Collaborator": np.array([0.7, 0.6, 0.6, 0.3, 0.8]),# consistent, high retention
             "Mixed Learner": np.array([0.5, 0.5, 0.5, 0.5, 0.5])       # balanced
         }
+        self.features = ['accuracy', 'avg_response_time', 'retry_rate', 'mistake_freq', 'retention']
+        # Sessions at or after this one count towards retention
+        self.retention_session = 15
+        # Temporal features: sessions per rolling accuracy window, and the fall from the
+        # best window to the latest one that flags a student as forgetting
+        self.temporal_window = 3
+        self.forgetting_drop = 0.15
+        # Distance backend for pattern matching: euclidean, weighted_euclidean or cosine
+        self.distance_metric = distance_metric
+        self.feature_weights = feature_weights
 
-    def _estimate_retention(self, student_logs):
-        # late-session accuracy (e.g. sessions 15-20)
-        late_sessions = student_logs[student_logs['session'] >= 15]
-        if len(late_sessions) == 0:
-            return 0.5
-        return late_sessions['correct'].mean()
+    def aggregate_logs(self, logs_df):
+        # Per-student running sums for every metric, built in one grouped pass
+        late = logs_df['session'] >= self.retention_session
+        correct = logs_df['correct'].astype('float64')
+        frame = pd.DataFrame({
+            'student_id': logs_df['student_id'],
+            'session': logs_df['session'],
+            'correct': correct,
+            'response_time': logs_df['response_time'].astype('float64'),
+            'retried': logs_df['retried'].astype('float64'),
+            'late': late.astype('int64'),
+            'late_correct': correct.where(late, 0.0)
+        })
+        return frame.groupby('student_id', sort=False, observed=True).agg(
+            count=('correct', 'size'),
+            correct_sum=('correct', 'sum'),
+            response_time_sum=('response_time', 'sum'),
+            retried_sum=('retried', 'sum'),
+            sessions_completed=('session', 'nunique'),
+            late_count=('late', 'sum'),
+            late_correct_sum=('late_correct', 'sum')
+        )
 
-    def analyze_all(self, students_df, logs_df):
-        metrics = []
-        
-        for idx, student in students_df.iterrows():
-            sid = student['student_id']
-            s_logs = logs_df[logs_df['student_id'] == sid]
-            
-            if len(s_logs) == 0:
-                continue
-                
-            accuracy = s_logs['correct'].mean()
-            avg_response_time = s_logs['response_time'].mean()
-            retry_rate = s_logs['retried'].mean()
-            mistake_freq = 1.0 - accuracy  # complementary to accuracy
-            sessions_completed = s_logs['session'].nunique()
-            retention_score = self._estimate_retention(s_logs)
-            
-            metrics.append({
-                'student_id': sid,
-                'name': student['name'],
-                'grade': student['grade'],
-                'accuracy': accuracy,
-                'avg_response_time': avg_response_time,
-                'retry_rate': retry_rate,
-                'mistake_freq': mistake_freq,
-                'sessions_completed': sessions_completed,
-                'retention': retention_score
-            })
-            
-        metrics_df = pd.DataFrame(metrics)
-        
+    def metrics_from_sums(self, students_df, sums):
+        # Turn per-student sums into the raw metric columns of metrics_df
+        raw = pd.DataFrame(index=sums.index)
+        raw['accuracy'] = sums['correct_sum'] / sums['count']
+        raw['avg_response_time'] = sums['response_time_sum'] / sums['count']
+        raw['retry_rate'] = sums['retried_sum'] / sums['count']
+        raw['mistake_freq'] = 1.0 - raw['accuracy']  # complementary to accuracy
+        raw['sessions_completed'] = sums['sessions_completed'].astype('int64')
+        late_count = sums['late_count']
+        raw['retention'] = (sums['late_correct_sum'] / late_count.where(late_count > 0)).fillna(0.5)
+        raw.index.name = 'student_id'
+
+        # Inner join keeps the students_df order and drops students without logs
+        metrics_df = students_df[['student_id', 'name', 'grade']].merge(
+            raw, left_on='student_id', right_index=True, how='inner'
+        )
+        # The join key takes the dtype of the sums index; keep the caller's id dtype instead
+        metrics_df['student_id'] = metrics_df['student_id'].astype(students_df['student_id'].dtype)
+        return metrics_df.reset_index(drop=True)
+
+    def temporal_features(self, logs_df):
+        # Rolling accuracy, learning-curve slope, response-time decay and forgetting
+        # indicators for every student at once (see temporal.py)
+        return temporal_features(logs_df, self.temporal_window, self.forgetting_drop)
+
+    def add_temporal_features(self, metrics_df, logs_df):
+        features = self.temporal_features(logs_df)
+        features['student_id'] = features['student_id'].astype(metrics_df['student_id'].dtype)
+        return metrics_df.merge(features, on='student_id', how='left')
+
+    def get_classifier(self):
+        return NearestProfileClassifier(self.profiles, metric=self.distance_metric, weights=self.feature_weights)
+
+    @timed("analyzer.classify")
+    def classify(self, metrics_df):
         # Normalize metrics for classification using Euclidean distance
-        features = ['accuracy', 'avg_response_time', 'retry_rate', 'mistake_freq', 'retention']
+        # sklearn is slow to import, so only pay for it once something is classified
+        from sklearn.preprocessing import MinMaxScaler
+
+        features = self.features
         scaler = MinMaxScaler()
         normalized_data = scaler.fit_transform(metrics_df[features])
-        
-        # Classification
-        patterns = []
-        for row in normalized_data:
-            distances = {
-                pattern: np.linalg.norm(row - profile)
-                for pattern, profile in self.profiles.items()
-            }
-            best_pattern = min(distances, key=distances.get)
-            patterns.append(best_pattern)
-            
+
+        # Classification against every profile at once
+        patterns, _, _ = self.get_classifier().classify(normalized_data)
+
         metrics_df['pattern'] = patterns
-        
-        # We also want to keep the normalized data around if helpful, 
-        # but let's just return metrics_df with everything.
+
         # Add the normalized columns for easy radar plotting
         for i, f in enumerate(features):
             metrics_df[f"{f}_norm"] = normalized_data[:, i]
-            
+
         return metrics_df
 
+    @timed("analyzer.analyze_all")
+    def analyze_all(self, students_df, logs_df, workers=1, temporal=False):
+        # workers > 1 partitions the log rows by student across a process pool; the
+        # normalization and classification below still run once over every student.
+        # temporal=True appends the temporal feature columns.
+        if workers > 1:
+            from parallel import parallel_aggregate_logs
+            sums = parallel_aggregate_logs(self, logs_df, workers)
+        else:
+            sums = self.aggregate_logs(logs_df)
+        metrics_df = self.classify(self.metrics_from_sums(students_df, sums))
+        if temporal:
+            metrics_df = self.add_temporal_features(metrics_df, logs_df)
+        return metrics_df
+
+    def analyze_chunks(self, students_df, chunks):
+        # Out-of-core variant of analyze_all for logs that arrive as an iterable of chunks
+        # (pd.read_csv(..., chunksize=...), iter_mock_data, ...)
+        accumulator = LogAccumulator(self)
+        for chunk in chunks:
+            accumulator.ingest(chunk)
+        return accumulator.finalize(students_df)
+
+class LogAccumulator:
+    # Per-student running sums; memory grows with the number of students, not log rows
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.ids = []
+        self.codes = {}
+        self.count = np.zeros(0, dtype=np.int64)
+        self.correct_sum = np.zeros(0)
+        self.response_time_sum = np.zeros(0)
+        self.retried_sum = np.zeros(0)
+        self.late_count = np.zeros(0, dtype=np.int64)
+        self.late_correct_sum = np.zeros(0)
+        # seen_sessions[student, column] marks the distinct sessions each student completed;
+        # sessions get dense column numbers, so the width is the number of distinct
+        # sessions rather than the largest session number
+        self.session_columns = {}
+        self.seen_sessions = np.zeros((0, 0), dtype=bool)
+
+    def _grow(self, n_students, n_sessions):
+        rows, cols = self.seen_sessions.shape
+        if n_students > len(self.count):
+            capacity = max(n_students, 2 * len(self.count))
+            extra = capacity - len(self.count)
+            for name in ('count', 'correct_sum', 'response_time_sum', 'retried_sum', 'late_count', 'late_correct_sum'):
+                arr = getattr(self, name)
+                setattr(self, name, np.concatenate([arr, np.zeros(extra, dtype=arr.dtype)]))
+            rows = capacity
+        cols = max(cols, n_sessions)
+        if (rows, cols) != self.seen_sessions.shape:
+            seen = np.zeros((rows, cols), dtype=bool)
+            seen[:self.seen_sessions.shape[0], :self.seen_sessions.shape[1]] = self.seen_sessions
+            self.seen_sessions = seen
+
+    def student_codes(self, student_ids):
+        # Map ids to dense row numbers, registering unseen students on the way
+        local, uniques = pd.factorize(np.asarray(student_ids))
+        lookup = np.empty(len(uniques), dtype=np.int64)
+        for i, sid in enumerate(uniques):
+            code = self.codes.get(sid)
+            if code is None:
+                code = len(self.ids)
+                self.codes[sid] = code
+                self.ids.append(sid)
+            lookup[i] = code
+        return lookup[local]
+
+    def session_codes(self, sessions):
+        local, uniques = pd.factorize(np.asarray(sessions, dtype=np.int64))
+        lookup = np.array([self.session_columns.setdefault(int(s), len(self.session_columns)) for s in uniques],
+                          dtype=np.int64)
+        return lookup[local]
+
+    def ingest(self, logs_df):
+        # Folds a chunk of logs into the running sums and returns the codes it touched
+        if len(logs_df) == 0:
+            return np.zeros(0, dtype=np.int64)
+        codes = self.student_codes(logs_df['student_id'])
+        session = logs_df['session'].to_numpy(dtype=np.int64)
+        columns = self.session_codes(session)
+        self._grow(len(self.ids), len(self.session_columns))
+
+        correct = logs_df['correct'].to_numpy(dtype=np.float64)
+        late = session >= self.analyzer.retention_session
+        self._scatter_add(self.count, codes, None)
+        self._scatter_add(self.correct_sum, codes, correct)
+        self._scatter_add(self.response_time_sum, codes, logs_df['response_time'].to_numpy(dtype=np.float64))
+        self._scatter_add(self.retried_sum, codes, logs_df['retried'].to_numpy(dtype=np.float64))
+        self._scatter_add(self.late_count, codes, late.astype(np.int64))
+        self._scatter_add(self.late_correct_sum, codes, correct * late)
+        self.seen_sessions[codes, columns] = True
+        return np.unique(codes)
+
+    def _scatter_add(self, target, codes, weights):
+        # Small micro-batches touch few students, so avoid the O(students) bincount
+        if len(codes) * 8 < len(target):
+            np.add.at(target, codes, 1 if weights is None else weights)
+        else:
+            target += np.bincount(codes, weights=weights, minlength=len(target)).astype(target.dtype)
+
+    def add(self, student_id, session, correct, response_time, retried):
+        # O(1) update for a single answer event; returns the student's code
+        code = self.codes.get(student_id)
+        if code is None:
+            code = len(self.ids)
+            self.codes[student_id] = code
+            self.ids.append(student_id)
+        session = int(session)
+        column = self.session_columns.setdefault(session, len(self.session_columns))
+        self._grow(len(self.ids), len(self.session_columns))
+
+        self.count[code] += 1
+        self.correct_sum[code] += correct
+        self.response_time_sum[code] += response_time
+        self.retried_sum[code] += retried
+        if session >= self.analyzer.retention_session:
+            self.late_count[code] += 1
+            self.late_correct_sum[code] += correct
+        self.seen_sessions[code, column] = True
+        return code
+
+    def sums(self):
+        # Same layout as CognitiveAnalyzer.aggregate_logs
+        n = len(self.ids)
+        return pd.DataFrame({
+            'count': self.count[:n],
+            'correct_sum': self.correct_sum[:n],
+            'response_time_sum': self.response_time_sum[:n],
+            'retried_sum': self.retried_sum[:n],
+            'sessions_completed': self.seen_sessions[:n].sum(axis=1),
+            'late_count': self.late_count[:n],
+            'late_correct_sum': self.late_correct_sum[:n]
+        }, index=pd.Index(self.ids, name='student_id', dtype=object))
+
+    def finalize(self, students_df):
+        metrics_df = self.analyzer.metrics_from_sums(students_df, self.sums())
+        return self.analyzer.classify(metrics_df)
+
 if __name__ == "__main__":
     from data_generator import generate_mock_data
     s, l = generate_mock_data()
@@ -1,24 +1,66 @@
 import dash
-from dash import dcc, html, Input, Output, dash_table
-import plotly.express as px
+from dash import dcc, html, Input, Output, State, dash_table
+from dash.exceptions import PreventUpdate
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+import os
+import threading
+import time
+import base64
+import io
+import shutil
+import tempfile
+import flask
 
 # Import backend modules
+from binning import bin_2d, box_stats, histogram
+from cohorts import CohortRegistry
+from columnar_store import write_store
 from data_generator import generate_mock_data
-from analyzer import CognitiveAnalyzer
-from recommender import RecommendationEngine
-from report_generator import generate_report_data
+from ingestion import DataValidationError, ingest_log_csv
+from instrumentation import metrics, timed
+from result_cache import ResultCache
 
 # ----------------- Data Initialization ----------------- #
-students_df, logs_df = generate_mock_data()
-analyzer = CognitiveAnalyzer()
-metrics_df = analyzer.analyze_all(students_df, logs_df)
-recommender = RecommendationEngine()
-recs_df = recommender.get_all_recommendations(metrics_df)
-report_data = generate_report_data(students_df, logs_df, metrics_df)
+# Nothing is generated or analyzed here: each cohort's context builds its artifacts on
+# first use (or in the background via warm_up()), so importing this module stays cheap.
+# New events are folded in by a per-cohort background worker every
+# COGNILEARN_REFRESH_SECONDS (0 refreshes inside the callbacks instead). Setting
+# COGNILEARN_CACHE_DIR keeps results of loaded cohorts on disk across restarts.
+# Uploaded log files are written as column stores under COGNILEARN_UPLOAD_DIR and
+# re-read from there, so an evicted upload holds no memory.
+DEFAULT_COHORT = "Demo School"
+CACHE_DIR = os.environ.get("COGNILEARN_CACHE_DIR")
+UPLOAD_DIR = os.environ.get("COGNILEARN_UPLOAD_DIR") or os.path.join(tempfile.gettempdir(), "cognilearn-uploads")
+registry = CohortRegistry(memory_budget_bytes=int(os.environ.get("COGNILEARN_MEMORY_BUDGET_MB", "2048")) * 1024 ** 2,
+                          refresh_interval=float(os.environ.get("COGNILEARN_REFRESH_SECONDS", "2")),
+                          result_cache=ResultCache(CACHE_DIR) if CACHE_DIR else None)
+registry.register(DEFAULT_COHORT, generate_mock_data)
+if os.environ.get("COGNILEARN_COHORT_DIR"):
+    registry.register_directory(os.environ["COGNILEARN_COHORT_DIR"])
+
+_selection = threading.local()
+# Cohort name -> column store path of every uploaded cohort
+_uploads = {}
+_upload_lock = threading.Lock()
+
+def select_cohort(name):
+    # Callbacks run on worker threads, so the selected cohort is tracked per thread.
+    # The cohort's current snapshot is pinned as well: everything one callback reads
+    # comes from the same data version, even if a newer snapshot is swapped in meanwhile.
+    _selection.cohort = name if name in registry.loaders else DEFAULT_COHORT
+    ctx = registry.get(_selection.cohort)
+    ctx.request_refresh()
+    _selection.snapshot = ctx.snapshot
+
+def current_context():
+    snapshot = getattr(_selection, 'snapshot', None)
+    if snapshot is None:
+        select_cohort(DEFAULT_COHORT)
+        snapshot = _selection.snapshot
+    return snapshot
 
 # Global variables for styling
 COLORS = {
@@ -43,6 +85,14 @@ PATTERN_COLORS = {
     "Mixed Learner": COLORS['Yellow']
 }
 
+# Rows per page of the intervention priority table
+PRIORITY_PAGE_SIZE = 10
+# Up to SVG_POINT_LIMIT students, distribution charts draw one point per student. Above
+# it, histograms and boxes are drawn from NumPy summaries and the scatter uses WebGL;
+# above WEBGL_POINT_LIMIT the scatter shows students binned on a 2D grid instead.
+SVG_POINT_LIMIT = 5000
+WEBGL_POINT_LIMIT = 50000
+
 EXTERNAL_STYLESHEETS = [
     "https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap"
 ]
@@ -79,6 +129,11 @@ app.index_string = f'''
 </html>
 '''
 
+def px():
+    # plotly.express is slow to import, so it is deferred until the first chart is built
+    import plotly.express
+    return plotly.express
+
 # Common chart layout settings
 def apply_chart_layout(fig):
     fig.update_layout(
@@ -122,7 +177,26 @@ app.layout = html.Div(
     children=[
         html.Div([
             html.H1(["Cogni", html.Span("Learn AI", style={'color': COLORS['Cyan']})], 
-                    style={'margin': '0', 'fontSize': '36px', 'fontWeight': '700', 'letterSpacing': '-0.02em'})
+                    style={'margin': '0', 'fontSize': '36px', 'fontWeight': '700', 'letterSpacing': '-0.02em'}),
+            html.Div([
+                html.Div(id="upload-status", style={'fontSize': '13px', 'color': COLORS['text_muted'], 'marginRight': '16px'}),
+                dcc.Upload(
+                    id="upload-logs",
+                    children=html.Div("Upload log CSV"),
+                    accept=".csv",
+                    style={
+                        'padding': '8px 16px', 'marginRight': '16px', 'cursor': 'pointer',
+                        'border': f"1px dashed {COLORS['border']}", 'borderRadius': '8px', 'fontSize': '14px'
+                    }
+                ),
+                dcc.Dropdown(
+                    id="cohort-select",
+                    options=[{'label': name, 'value': name} for name in registry.names()],
+                    value=DEFAULT_COHORT,
+                    clearable=False,
+                    style={'width': '280px', 'color': 'black', 'borderRadius': '8px'}
+                )
+            ], style={'display': 'flex', 'alignItems': 'center'})
         ], style={'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center', 'marginBottom': '40px'}),
         
         dcc.Tabs(
@@ -157,22 +231,189 @@ app.layout = html.Div(
     ]
 )
 
+# ----------------- Figure Builders ----------------- #
+def cached_figure(name, build, student_id=None):
+    ctx = current_context()
+    # Serialized figures are reused until the data version moves on
+    return ctx.figure_cache.get(name, build, student_id=student_id, version=ctx.aggregates.version)
+
+def build_accuracy_hist():
+    ctx = current_context()
+    if len(ctx.metrics_df) > SVG_POINT_LIMIT:
+        centers, widths, counts = histogram(ctx.metrics_df['accuracy'], bins=10)
+        fig = go.Figure(go.Bar(x=centers, y=counts, width=widths, marker_color=COLORS['Cyan']))
+        fig.update_layout(title="Accuracy Distribution", xaxis_title="accuracy", yaxis_title="count")
+        return apply_chart_layout(fig)
+    return apply_chart_layout(px().histogram(ctx.metrics_df, x="accuracy", nbins=10, title="Accuracy Distribution", color_discrete_sequence=[COLORS['Cyan']]))
+
+def build_pattern_pie():
+    ctx = current_context()
+    fig_pie = apply_chart_layout(px().pie(ctx.aggregates.pattern_counts, names="pattern", values="count", title="Pattern Distribution", color="pattern", color_discrete_map=PATTERN_COLORS))
+    fig_pie.update_traces(hole=0.4)
+    return fig_pie
+
+def build_rt_accuracy_scatter():
+    ctx = current_context()
+    m = ctx.metrics_df
+    if len(m) <= SVG_POINT_LIMIT:
+        return apply_chart_layout(px().scatter(m, x="avg_response_time", y="accuracy", color="pattern", title="Response Time vs Accuracy", color_discrete_map=PATTERN_COLORS, hover_data=['name']))
+
+    fig = go.Figure()
+    if len(m) <= WEBGL_POINT_LIMIT:
+        for pattern, rows in m.groupby('pattern', sort=False, observed=True):
+            fig.add_trace(go.Scattergl(
+                x=rows['avg_response_time'], y=rows['accuracy'], text=rows['name'], mode='markers', name=pattern,
+                marker={'color': PATTERN_COLORS.get(pattern, COLORS['Cyan']), 'size': 4}
+            ))
+    else:
+        cells = bin_2d(m, 'avg_response_time', 'accuracy', 'pattern')
+        largest = cells['count'].max()
+        for pattern, rows in cells.groupby('pattern', sort=False, observed=True):
+            fig.add_trace(go.Scattergl(
+                x=rows['avg_response_time'], y=rows['accuracy'], customdata=rows['count'], mode='markers', name=pattern,
+                marker={'color': PATTERN_COLORS.get(pattern, COLORS['Cyan']), 'size': 4 + 16 * np.sqrt(rows['count'] / largest)},
+                hovertemplate="%{customdata} students<extra>" + pattern + "</extra>"
+            ))
+    fig.update_layout(title="Response Time vs Accuracy", xaxis_title="avg_response_time", yaxis_title="accuracy", legend_title_text="pattern")
+    return apply_chart_layout(fig)
+
+def build_class_trend():
+    ctx = current_context()
+    trend_df = ctx.aggregates.session_trend
+    return apply_chart_layout(px().line(trend_df, x="session", y="score", title="Class Performance Trend", markers=True, color_discrete_sequence=[COLORS['Green']]))
+
+def build_pattern_radar():
+    ctx = current_context()
+    categories = ['accuracy', 'avg_response_time', 'retry_rate', 'mistake_freq', 'retention']
+    fig_radar = go.Figure()
+    
+    grouped_norm = ctx.aggregates.pattern_means
+    for _, row in grouped_norm.iterrows():
+        fig_radar.add_trace(go.Scatterpolar(
+            r=row[[f"{c}_norm" for c in categories]].tolist(),
+            theta=categories,
+            fill='toself',
+            name=row['pattern'],
+            marker_color=PATTERN_COLORS.get(row['pattern'], COLORS['Cyan'])
+        ))
+    fig_radar.update_layout(
+        polar={'radialaxis': {'visible': True, 'range': [0, 1], 'gridcolor': 'rgba(255,255,255,0.1)'}, 'bgcolor': 'rgba(0,0,0,0)'},
+        paper_bgcolor='rgba(0,0,0,0)',
+        font={'family': "Outfit", 'color': COLORS['text']},
+        title="Pattern Metric Profiles (Normalized)",
+        margin={'t': 60, 'b': 40, 'l': 40, 'r': 40}
+    )
+    return fig_radar
+
+def build_pattern_box(column, title):
+    ctx = current_context()
+    if len(ctx.metrics_df) <= SVG_POINT_LIMIT:
+        return apply_chart_layout(px().box(ctx.metrics_df, x="pattern", y=column, color="pattern", title=title, color_discrete_map=PATTERN_COLORS))
+
+    # Precomputed quartiles and whiskers; outlying students are counted, not drawn
+    fig = go.Figure()
+    for _, row in box_stats(ctx.metrics_df, 'pattern', column).iterrows():
+        fig.add_trace(go.Box(
+            x=[row['pattern']], q1=[row['q1']], median=[row['median']], q3=[row['q3']], mean=[row['mean']],
+            lowerfence=[row['lowerfence']], upperfence=[row['upperfence']], name=row['pattern'],
+            marker_color=PATTERN_COLORS.get(row['pattern'], COLORS['Cyan']),
+            hovertext=f"{row['count']} students, {row['outliers']} outliers"
+        ))
+    fig.update_layout(title=title, xaxis_title="pattern", yaxis_title=column, legend_title_text="pattern")
+    return apply_chart_layout(fig)
+
+def build_accuracy_box():
+    return build_pattern_box("accuracy", "Accuracy by Pattern")
+
+def build_rt_box():
+    return build_pattern_box("avg_response_time", "Response Time by Pattern")
+
+def build_pattern_heatmap():
+    ctx = current_context()
+    heatmap_data = ctx.aggregates.pattern_means.set_index('pattern')
+    return apply_chart_layout(px().imshow(heatmap_data, labels={'x': "Metric", 'y': "Pattern", 'color': "Score"}, title="Pattern Attributes Heatmap", color_continuous_scale="Viridis", aspect="auto"))
+
+def build_pattern_trajectory():
+    ctx = current_context()
+    return apply_chart_layout(px().line(
+        ctx.aggregates.pattern_trajectory,
+        x="session", y="score", color="pattern", title="Improvement Trajectory by Pattern", color_discrete_map=PATTERN_COLORS
+    ))
+
+def build_learning_funnel():
+    ctx = current_context()
+    s = ctx.report_data['summary']
+    # Enrolled counts every student of the cohort, Active those with logged answers
+    # (metrics_df only has rows for them); at-risk students are a subset of the active
+    active = len(ctx.metrics_df)
+    funnel_data = pd.DataFrame([
+        dict(stage="Enrolled", count=len(ctx.students_df)),
+        dict(stage="Active", count=active),
+        dict(stage="Progressing", count=active - s['at_risk_count']),
+        dict(stage="Proficient", count=ctx.aggregates.funnel_counts['proficient']),
+        dict(stage="Mastery", count=ctx.aggregates.funnel_counts['mastery'])
+    ])
+    fig_funnel = apply_chart_layout(px().funnel(funnel_data, x='count', y='stage', title="Student Learning Funnel"))
+    fig_funnel.update_traces(marker=dict(color=COLORS['Cyan']))
+    return fig_funnel
+
+def build_student_combo(student_id, pat_color):
+    ctx = current_context()
+    # Line+bar combo chart 
+    fig_combo = make_subplots(specs=[[{"secondary_y": True}]])
+    
+    s_trend = ctx.aggregates.student_trend(student_id)
+    
+    fig_combo.add_trace(
+        go.Bar(x=s_trend['session'], y=s_trend['response_time'], name="Response Time (s)", marker_color='rgba(255,255,255,0.1)'),
+        secondary_y=False
+    )
+    fig_combo.add_trace(
+        go.Scatter(x=s_trend['session'], y=s_trend['score'], name="Score", line={'color': pat_color, 'width': 4}, mode='lines+markers', marker={'size': 8, 'line': {'width': 2, 'color': COLORS['bg']}}),
+        secondary_y=True
+    )
+    fig_combo.update_layout(title="Performance Over Time", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font={'family': "Outfit", 'color': COLORS['text']}, margin={'t': 60, 'b': 40, 'l': 40, 'r': 40})
+    fig_combo.update_yaxes(title_text="Response Time /s", secondary_y=False, gridcolor='rgba(255,255,255,0.05)')
+    fig_combo.update_yaxes(title_text="Score", secondary_y=True, gridcolor='rgba(0,0,0,0)')
+    fig_combo.update_xaxes(gridcolor='rgba(255,255,255,0.05)')
+    return fig_combo
+
+def build_student_curve(student_id, pat_color):
+    ctx = current_context()
+    # Per-session accuracy with its rolling window and least-squares trend
+    curve = ctx.aggregates.student_learning_curve(student_id)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=curve['session'], y=curve['accuracy'], name="Session Accuracy", mode='markers', marker={'color': COLORS['text_muted'], 'size': 7}))
+    fig.add_trace(go.Scatter(x=curve['session'], y=curve['rolling_accuracy'], name="Rolling Accuracy", mode='lines', line={'color': pat_color, 'width': 3}))
+    fig.add_trace(go.Scatter(x=curve['session'], y=curve['trend'], name="Trend", mode='lines', line={'color': COLORS['Orange'], 'dash': 'dash'}))
+    fig.update_layout(title="Learning Curve", xaxis_title="Session", yaxis={'tickformat': '.0%'})
+    return apply_chart_layout(fig)
+
+def build_student_mistakes(student_id):
+    ctx = current_context()
+    # Mistake frequency by subject
+    mistakes = ctx.aggregates.student_mistakes(student_id)
+    # Use empty if perfectly accurate to avoid errors
+    if len(mistakes) == 0:
+        return apply_chart_layout(go.Figure().add_annotation(text="No mistakes recorded!", showarrow=False, font={'size': 20}))
+    return apply_chart_layout(px().bar(mistakes, x="subject", y="count", title="Mistakes by Subject", color_discrete_sequence=[COLORS['Red']]))
+
 # ----------------- Tab Generators ----------------- #
 def render_tab_1():
-    avg_acc = f"{metrics_df['accuracy'].mean()*100:.1f}%"
-    avg_rt = f"{metrics_df['avg_response_time'].mean():.1f}s"
-    top_pattern = metrics_df['pattern'].mode()[0]
-    avg_ret = f"{metrics_df['retention'].mean()*100:.1f}%"
+    ctx = current_context()
+    kpis = ctx.aggregates.kpis
+    avg_acc = f"{kpis['avg_accuracy']*100:.1f}%"
+    avg_rt = f"{kpis['avg_response_time']:.1f}s"
+    top_pattern = kpis['top_pattern']
+    avg_ret = f"{kpis['avg_retention']*100:.1f}%"
     
     # Charts
-    fig_hist = apply_chart_layout(px.histogram(metrics_df, x="accuracy", nbins=10, title="Accuracy Distribution", color_discrete_sequence=[COLORS['Cyan']]))
-    fig_pie = apply_chart_layout(px.pie(metrics_df, names="pattern", title="Pattern Distribution", color="pattern", color_discrete_map=PATTERN_COLORS))
-    fig_pie.update_traces(hole=0.4)
-    fig_scatter = apply_chart_layout(px.scatter(metrics_df, x="avg_response_time", y="accuracy", color="pattern", title="Response Time vs Accuracy", color_discrete_map=PATTERN_COLORS, hover_data=['name']))
+    fig_hist = cached_figure("accuracy_hist", build_accuracy_hist)
+    fig_pie = cached_figure("pattern_pie", build_pattern_pie)
+    fig_scatter = cached_figure("rt_accuracy_scatter", build_rt_accuracy_scatter)
     
     # Line chart trend
-    trend_df = logs_df.groupby('session')['score'].mean().reset_index()
-    fig_line = apply_chart_layout(px.line(trend_df, x="session", y="score", title="Class Performance Trend", markers=True, color_discrete_sequence=[COLORS['Green']]))
+    fig_line = cached_figure("class_trend", build_class_trend)
     
     chart_style = {'flex': '1', 'margin': '12px', 'backgroundColor': COLORS['card'], 'borderRadius': '12px', 'border': f"1px solid {COLORS['border']}", 'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)'}
 
@@ -196,34 +437,10 @@ def render_tab_1():
     ])
 
 def render_tab_2():
-    # Radar chart
-    categories = ['accuracy', 'avg_response_time', 'retry_rate', 'mistake_freq', 'retention']
-    fig_radar = go.Figure()
-    
-    grouped_norm = metrics_df.groupby('pattern')[[f"{c}_norm" for c in categories]].mean().reset_index()
-    for _, row in grouped_norm.iterrows():
-        fig_radar.add_trace(go.Scatterpolar(
-            r=row[[f"{c}_norm" for c in categories]].tolist(),
-            theta=categories,
-            fill='toself',
-            name=row['pattern'],
-            marker_color=PATTERN_COLORS.get(row['pattern'], COLORS['Cyan'])
-        ))
-    fig_radar.update_layout(
-        polar={'radialaxis': {'visible': True, 'range': [0, 1], 'gridcolor': 'rgba(255,255,255,0.1)'}, 'bgcolor': 'rgba(0,0,0,0)'},
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'family': "Outfit", 'color': COLORS['text']},
-        title="Pattern Metric Profiles (Normalized)",
-        margin={'t': 60, 'b': 40, 'l': 40, 'r': 40}
-    )
-    
-    # Box plots
-    fig_box_acc = apply_chart_layout(px.box(metrics_df, x="pattern", y="accuracy", color="pattern", title="Accuracy by Pattern", color_discrete_map=PATTERN_COLORS))
-    fig_box_rt = apply_chart_layout(px.box(metrics_df, x="pattern", y="avg_response_time", color="pattern", title="Response Time by Pattern", color_discrete_map=PATTERN_COLORS))
-    
-    # Heatmap
-    heatmap_data = grouped_norm.set_index('pattern')
-    fig_heat = apply_chart_layout(px.imshow(heatmap_data, labels={'x': "Metric", 'y': "Pattern", 'color': "Score"}, title="Pattern Attributes Heatmap", color_continuous_scale="Viridis", aspect="auto"))
+    fig_radar = cached_figure("pattern_radar", build_pattern_radar)
+    fig_box_acc = cached_figure("accuracy_box", build_accuracy_box)
+    fig_box_rt = cached_figure("rt_box", build_rt_box)
+    fig_heat = cached_figure("pattern_heatmap", build_pattern_heatmap)
     
     chart_style = {'flex': '1', 'margin': '12px', 'backgroundColor': COLORS['card'], 'border': f"1px solid {COLORS['border']}", 'borderRadius': '12px', 'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)'}
     
@@ -240,7 +457,9 @@ def render_tab_2():
     ])
 
 def render_tab_3():
-    options = [{'label': f"{r['name']} ({r['pattern']})", 'value': r['student_id']} for _, r in metrics_df.iterrows()]
+    ctx = current_context()
+    # Only the first matches are sent; typing searches the rest on the server
+    options = ctx.student_search.options()
     
     return html.Div([
         html.Div([
@@ -249,6 +468,7 @@ def render_tab_3():
                 id="student-select",
                 options=options,
                 value=options[0]['value'],
+                placeholder="Search name, ID or pattern",
                 style={'width': '350px', 'color': 'black', 'borderRadius': '8px'}
             )
         ], style={
@@ -262,7 +482,8 @@ def render_tab_3():
     ])
 
 def render_tab_4():
-    strategies = recommender.get_pattern_strategies()
+    ctx = current_context()
+    strategies = ctx.recommender.get_pattern_strategies()
     
     cards = []
     for pattern, strats in strategies.items():
@@ -279,7 +500,8 @@ def render_tab_4():
             ]
         ))
         
-    table_df = recs_df.copy()
+    # Only the first page is sent; update_priority_table serves the rest from the index
+    first_page, page_count = ctx.table_index.page(0, PRIORITY_PAGE_SIZE)
     
     # Style condition for Priority
     style_cond = [
@@ -289,10 +511,18 @@ def render_tab_4():
     ]
     
     table = dash_table.DataTable(
-        data=table_df.to_dict('records'),
-        columns=[{"name": i, "id": i} for i in table_df.columns],
-        sort_action='native',
-        page_size=10,
+        id="priority-table",
+        data=first_page,
+        columns=[{"name": i, "id": i} for i in ctx.recs_df.columns],
+        page_current=0,
+        page_size=PRIORITY_PAGE_SIZE,
+        page_count=page_count,
+        page_action='custom',
+        sort_action='custom',
+        sort_mode='single',
+        sort_by=[],
+        filter_action='custom',
+        filter_query='',
         style_table={'overflowX': 'auto', 'borderRadius': '12px', 'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)'},
         style_header={'backgroundColor': COLORS['card'], 'color': COLORS['text_muted'], 'fontWeight': '600', 'fontFamily': 'Inter', 'borderBottom': f"2px solid {COLORS['border']}", 'padding': '16px'},
         style_cell={'backgroundColor': COLORS['bg'], 'color': COLORS['text'], 'fontFamily': 'Inter', 'padding': '16px', 'textAlign': 'left', 'border': f"1px solid {COLORS['border']}", 'fontSize': '14px'},
@@ -307,27 +537,15 @@ def render_tab_4():
     ])
 
 def render_tab_5():
-    s = report_data['summary']
-    
-    fig_multi = apply_chart_layout(px.line(
-        logs_df.merge(metrics_df[['student_id', 'pattern']], on='student_id').groupby(['pattern', 'session'])['score'].mean().reset_index(),
-        x="session", y="score", color="pattern", title="Improvement Trajectory by Pattern", color_discrete_map=PATTERN_COLORS
-    ))
+    ctx = current_context()
+    s = ctx.report_data['summary']
     
-    # Mock Funnel Data based on retention and risk
-    funnel_data = pd.DataFrame([
-        dict(stage="Enrolled", count=50),
-        dict(stage="Active", count=48),
-        dict(stage="Progressing", count=50 - s['at_risk_count']),
-        dict(stage="Proficient", count=len(metrics_df[metrics_df['accuracy'] > 0.75])),
-        dict(stage="Mastery", count=len(metrics_df[metrics_df['accuracy'] > 0.9]))
-    ])
-    fig_funnel = apply_chart_layout(px.funnel(funnel_data, x='count', y='stage', title="Student Learning Funnel"))
-    fig_funnel.update_traces(marker=dict(color=COLORS['Cyan']))
+    fig_multi = cached_figure("pattern_trajectory", build_pattern_trajectory)
+    fig_funnel = cached_figure("learning_funnel", build_learning_funnel)
     
     insights_list = html.Ul([
         html.Li(insight, style={'marginBottom': '15px', 'fontSize': '16px', 'lineHeight': '1.6'}) 
-        for insight in report_data['insights']
+        for insight in ctx.report_data['insights']
     ])
     
     chart_style = {'flex': '1', 'margin': '12px', 'backgroundColor': COLORS['card'], 'borderRadius': '12px', 'border': f"1px solid {COLORS['border']}", 'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)'}
@@ -354,9 +572,12 @@ def render_tab_5():
 # ----------------- Callbacks ----------------- #
 @app.callback(
     Output("tab-content", "children"),
-    Input("tabs", "value")
+    Input("tabs", "value"),
+    Input("cohort-select", "value")
 )
-def render_content(tab):
+@timed("render_content")
+def render_content(tab, cohort=DEFAULT_COHORT):
+    select_cohort(cohort)
     if tab == "tab-1":
         return render_tab_1()
     elif tab == "tab-2":
@@ -369,16 +590,87 @@ def render_content(tab):
         return render_tab_5()
     return html.Div("Unknown Tab")
 
+@app.callback(
+    Output("cohort-select", "options"),
+    Output("cohort-select", "value"),
+    Output("upload-status", "children"),
+    Input("upload-logs", "contents"),
+    State("upload-logs", "filename"),
+    State("cohort-select", "value"),
+    prevent_initial_call=True
+)
+def ingest_upload(contents, filename, cohort):
+    # Each uploaded log file becomes its own cohort, analyzed on first view
+    options = dash.no_update
+    if not contents:
+        return options, cohort, ""
+    try:
+        raw = base64.b64decode(contents.split(',', 1)[1])
+        students_df, logs_df, meta = ingest_log_csv(io.BytesIO(raw))
+    except DataValidationError as e:
+        return options, cohort, f"⚠️ {filename}: {e}"
+
+    name = os.path.splitext(filename or "upload")[0]
+    with _upload_lock:
+        # A re-upload under the same name replaces the cohort, including its resident
+        # context; built-in and directory cohorts are never replaced
+        if name in registry.loaders and name not in _uploads:
+            return options, cohort, f"⚠️ {filename}: a cohort named {name} already exists"
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        path = write_store(tempfile.mkdtemp(prefix="upload-", dir=UPLOAD_DIR),
+                           {'students': students_df, 'logs': logs_df})
+        registry.unregister(name)
+        previous = _uploads.pop(name, None)
+        if previous:
+            shutil.rmtree(previous, ignore_errors=True)
+        registry.register_store(name, path)
+        _uploads[name] = path
+    options = [{'label': n, 'value': n} for n in registry.names()]
+    status = f"{filename}: {meta['students']} students, {meta['rows_kept']} rows kept, {meta['rows_dropped']} dropped"
+    if meta['response_time_imputed']:
+        status += f", {meta['response_time_imputed']} response times imputed"
+    return options, name, status
+
+@app.callback(
+    Output("priority-table", "data"),
+    Output("priority-table", "page_count"),
+    Input("priority-table", "page_current"),
+    Input("priority-table", "page_size"),
+    Input("priority-table", "sort_by"),
+    Input("priority-table", "filter_query"),
+    State("cohort-select", "value")
+)
+@timed("update_priority_table")
+def update_priority_table(page_current, page_size, sort_by, filter_query, cohort=DEFAULT_COHORT):
+    select_cohort(cohort)
+    ctx = current_context()
+    return ctx.table_index.page(page_current, page_size or PRIORITY_PAGE_SIZE, sort_by, filter_query)
+
+@app.callback(
+    Output("student-select", "options"),
+    Input("student-select", "search_value"),
+    State("student-select", "value"),
+    State("cohort-select", "value")
+)
+def search_students(search_value, selected, cohort=DEFAULT_COHORT):
+    if search_value is None:
+        raise PreventUpdate
+    select_cohort(cohort)
+    return current_context().student_search.options(search_value, selected)
+
 @app.callback(
     Output("student-profile-content", "children"),
-    Input("student-select", "value")
+    Input("student-select", "value"),
+    State("cohort-select", "value")
 )
-def update_student_profile(student_id):
+@timed("update_student_profile")
+def update_student_profile(student_id, cohort=DEFAULT_COHORT):
     if not student_id:
         return html.Div()
+    select_cohort(cohort)
+    ctx = current_context()
         
-    student = metrics_df[metrics_df['student_id'] == student_id].iloc[0]
-    s_logs = logs_df[logs_df['student_id'] == student_id]
+    student = ctx.aggregates.student_row(student_id)
     
     pat_color = PATTERN_COLORS.get(student['pattern'], COLORS['Cyan'])
     
@@ -410,42 +702,71 @@ def update_student_profile(student_id):
         create_kpi_card("Retry Rate", f"{student['retry_rate']*100:.1f}%"),
         create_kpi_card("Retention", f"{student['retention']*100:.1f}%")
     ])
+    temporal = ctx.aggregates.student_temporal(student_id)
+    trend_kpis = html.Div(style={'display': 'flex', 'flexWrap': 'wrap', 'marginBottom': '30px'}, children=[
+        create_kpi_card("Recent Accuracy", f"{temporal['recent_accuracy']*100:.1f}%", f"Peak {temporal['peak_accuracy']*100:.1f}%"),
+        create_kpi_card("Learning Slope", f"{temporal['learning_slope']*100:+.1f} pts/session"),
+        create_kpi_card("Response Time Decay", f"{temporal['response_time_decay']*100:+.1f}%/session"),
+        create_kpi_card("Forgetting", "⚠️ Yes" if temporal['forgetting'] else "No", f"Drop {temporal['forgetting_drop']*100:.1f} pts from peak")
+    ])
     
-    # Line+bar combo chart 
-    fig_combo = make_subplots(specs=[[{"secondary_y": True}]])
-    
-    s_trend = s_logs.groupby('session').agg({'score':'mean', 'response_time':'mean'}).reset_index()
-    
-    fig_combo.add_trace(
-        go.Bar(x=s_trend['session'], y=s_trend['response_time'], name="Response Time (s)", marker_color='rgba(255,255,255,0.1)'),
-        secondary_y=False
-    )
-    fig_combo.add_trace(
-        go.Scatter(x=s_trend['session'], y=s_trend['score'], name="Score", line={'color': pat_color, 'width': 4}, mode='lines+markers', marker={'size': 8, 'line': {'width': 2, 'color': COLORS['bg']}}),
-        secondary_y=True
-    )
-    fig_combo.update_layout(title="Performance Over Time", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font={'family': "Outfit", 'color': COLORS['text']}, margin={'t': 60, 'b': 40, 'l': 40, 'r': 40})
-    fig_combo.update_yaxes(title_text="Response Time /s", secondary_y=False, gridcolor='rgba(255,255,255,0.05)')
-    fig_combo.update_yaxes(title_text="Score", secondary_y=True, gridcolor='rgba(0,0,0,0)')
-    fig_combo.update_xaxes(gridcolor='rgba(255,255,255,0.05)')
-    
-    # Mistake frequency by subject
-    mistakes = s_logs[s_logs['correct'] == 0].groupby('subject').size().reset_index(name='count')
-    # Use empty if perfectly accurate to avoid errors
-    if len(mistakes) == 0:
-        fig_mistakes = apply_chart_layout(go.Figure().add_annotation(text="No mistakes recorded!", showarrow=False, font={'size': 20}))
-    else:
-        fig_mistakes = apply_chart_layout(px.bar(mistakes, x="subject", y="count", title="Mistakes by Subject", color_discrete_sequence=[COLORS['Red']]))
+    fig_combo = cached_figure("student_combo", lambda: build_student_combo(student_id, pat_color), student_id)
+    fig_mistakes = cached_figure("student_mistakes", lambda: build_student_mistakes(student_id), student_id)
+    fig_curve = cached_figure("student_curve", lambda: build_student_curve(student_id, pat_color), student_id)
     
     chart_style = {'margin': '12px', 'backgroundColor': COLORS['card'], 'borderRadius': '12px', 'border': f"1px solid {COLORS['border']}", 'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)'}
     
     charts = html.Div([
         html.Div(dcc.Graph(figure=fig_combo), style={'flex': '2'} | chart_style),
-        html.Div(dcc.Graph(figure=fig_mistakes), style={'flex': '1'} | chart_style)
+        html.Div(dcc.Graph(figure=fig_mistakes), style={'flex': '1'} | chart_style),
+        html.Div(dcc.Graph(figure=fig_curve), style={'flex': '1 1 100%'} | chart_style)
     ], style={'display': 'flex', 'flexWrap': 'wrap'})
     
-    return html.Div([banner, kpis, charts])
+    return html.Div([banner, kpis, trend_kpis, charts])
+
+# ----------------- Monitoring ----------------- #
+def collect_cohort_metrics():
+    yield ("cohort_evictions_total", "counter", "Cohorts dropped to stay within the memory budget.", {}, registry.evictions)
+    if registry.result_cache is not None:
+        yield ("result_cache_hits_total", "counter", "Pipeline results loaded from disk.", {}, registry.result_cache.hits)
+        yield ("result_cache_misses_total", "counter", "Pipeline results not found on disk.", {}, registry.result_cache.misses)
+    for name, ctx in registry.resident_contexts():
+        stats = ctx.figure_cache.stats()
+        labels = {'cohort': name}
+        yield ("figure_cache_hits_total", "counter", "Figure cache hits.", labels, stats['hits'])
+        yield ("figure_cache_misses_total", "counter", "Figure cache misses.", labels, stats['misses'])
+        yield ("figure_cache_hit_ratio", "gauge", "Figure cache hit ratio.", labels, stats['hit_ratio'])
+        yield ("figure_cache_bytes", "gauge", "Serialized figures held in the cache.", labels, stats['bytes'])
+        yield ("cohort_memory_bytes", "gauge", "Approximate memory held by a cohort.", labels, ctx.memory_bytes())
+        yield ("cohort_data_version", "gauge", "Data version of a cohort, bumped on refresh.", labels, ctx.version)
+        snapshot = ctx.published_snapshot
+        if snapshot is not None:
+            yield ("snapshot_version", "gauge", "Data version of the snapshot being served.", labels, snapshot.version)
+            yield ("snapshot_build_seconds", "gauge", "Time the served snapshot took to build.", labels, snapshot.build_seconds)
+            yield ("snapshot_age_seconds", "gauge", "Time since the served snapshot was built.", labels, time.time() - snapshot.built_at)
+        for artifact, seconds in ctx.timings.items():
+            yield ("artifact_build_seconds", "gauge", "Time the last build of an artifact took.",
+                   labels | {'artifact': artifact}, seconds)
+
+metrics.register_collector(collect_cohort_metrics)
+
+@app.server.route("/metrics")
+def prometheus_metrics():
+    return flask.Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+@app.server.route("/profiles")
+def slow_call_profiles():
+    # Folded stacks of slow calls, ready for flamegraph.pl or speedscope. Read-only:
+    # profiling is switched on only by COGNILEARN_PROFILE_SLOW_MS at startup, never
+    # over HTTP, since it samples every instrumented call of every client.
+    out = []
+    for profile in list(metrics.profiles):
+        out.append(f"# {profile['name']} {profile['seconds'] * 1000:.1f} ms")
+        out.append(profile['folded'])
+    return flask.Response("\n".join(out) + "\n", mimetype="text/plain")
 
 if __name__ == "__main__":
     print(f"Starting CogniLearn AI dashboard at http://127.0.0.1:8050")
+    # Build the default cohort while the server comes up instead of on the first request
+    registry.get(DEFAULT_COHORT).warm_up()
     app.run(debug=False, port=8050)
@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from analyzer import CognitiveAnalyzer
+from data_generator import generate_mock_data
+from recommender import RecommendationEngine
+from report_generator import generate_report_data
+
+SCALES = {'50': 50, '5k': 5000, '50k': 50000, '500k': 500000}
+TABS = ['tab-1', 'tab-2', 'tab-3', 'tab-4', 'tab-5']
+# A benchmark counts as regressed once it is this much slower (or hungrier) than baseline,
+# and by more than the absolute floor, so jitter on millisecond calls is not flagged
+DEFAULT_THRESHOLD = 0.5
+MIN_DELTA = {'seconds': 0.01, 'peak_mb': 1.0}
+# Calls run at least twice (once only if slower than SLOW_CALL_SECONDS) and are repeated
+# until MIN_TOTAL_SECONDS is spent, at most MAX_REPEATS times; the best run is kept, so
+# one-off warm-up costs stay out of the numbers
+MIN_TOTAL_SECONDS = 0.5
+SLOW_CALL_SECONDS = 5.0
+MAX_REPEATS = 5
+
+def time_call(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def _more_runs(runs):
+    if not runs:
+        return True
+    if len(runs) >= MAX_REPEATS:
+        return False
+    return sum(runs) < MIN_TOTAL_SECONDS or (len(runs) < 2 and runs[0] < SLOW_CALL_SECONDS)
+
+def measure(fn, memory=True):
+    # Best wall time over untraced runs, then peak Python/numpy allocation from a traced
+    # one (tracemalloc slows allocation-heavy code, so it never overlaps the timed runs)
+    runs = []
+    while _more_runs(runs):
+        seconds, result = time_call(fn)
+        runs.append(seconds)
+    entry = {'seconds': min(runs), 'runs': len(runs)}
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            entry['peak_mb'] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+    return entry, result
+
+def bench_scale(n_students, memory=True):
+    # One cohort through every pipeline stage and dashboard callback
+    results = {}
+    bulk = n_students > 50
+    entry, (students_df, logs_df) = measure(lambda: generate_mock_data(n_students=n_students, bulk=bulk), memory)
+    results['generate_mock_data'] = entry
+
+    analyzer = CognitiveAnalyzer()
+    entry, metrics_df = measure(lambda: analyzer.analyze_all(students_df, logs_df), memory)
+    results['analyze_all'] = entry
+
+    recommender = RecommendationEngine()
+    entry, _ = measure(lambda: recommender.get_all_recommendations(metrics_df), memory)
+    results['get_all_recommendations'] = entry
+
+    entry, _ = measure(lambda: generate_report_data(students_df, logs_df, metrics_df), memory)
+    results['generate_report_data'] = entry
+
+    # Callbacks run against a fully built context with a cold figure cache, so they time
+    # figure building and serialization rather than the pipeline above
+    import app
+    cohort = f"benchmark-{n_students}"
+    app.registry.register(cohort, lambda: (students_df, logs_df))
+    try:
+        app.registry.get(cohort).warm_up(background=False)
+        app.select_cohort(cohort)
+        ctx = app.current_context()
+        for tab in TABS:
+            render = getattr(app, f"render_{tab.replace('-', '_')}")
+            def cold_render(render=render):
+                ctx.figure_cache.clear()
+                return render()
+            results[f"render_{tab.replace('-', '_')}"], _ = measure(cold_render, memory)
+
+        student_id = str(ctx.metrics_df['student_id'].iloc[0])
+        def cold_profile():
+            ctx.figure_cache.clear()
+            return app.update_student_profile(student_id, cohort)
+        results['update_student_profile'], _ = measure(cold_profile, memory)
+    finally:
+        app.registry.unregister(cohort)
+
+    results['_cohort'] = {'students': n_students, 'log_rows': len(logs_df)}
+    return results
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'cpu_count': os.cpu_count(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+def run_benchmarks(scales, memory=True):
+    # scales: {label: n_students}. The lazily imported heavy modules are loaded up front;
+    # their cost belongs to the cold start test, not to whichever benchmark runs first.
+    import sklearn.preprocessing
+    import plotly.express
+    return {
+        'environment': environment(),
+        'results': {label: bench_scale(n, memory) for label, n in scales.items()}
+    }
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    # Every (scale, benchmark, metric) present in both runs whose value grew by more than
+    # threshold; returns a list of dicts, empty when nothing regressed
+    regressions = []
+    for scale, benchmarks in current['results'].items():
+        for name, entry in benchmarks.items():
+            base = baseline.get('results', {}).get(scale, {}).get(name)
+            if name.startswith('_') or base is None:
+                continue
+            for metric in ('seconds', 'peak_mb'):
+                if metric in entry and base.get(metric):
+                    change = entry[metric] / base[metric] - 1
+                    if change > threshold and entry[metric] - base[metric] > MIN_DELTA[metric]:
+                        regressions.append({
+                            'scale': scale, 'benchmark': name, 'metric': metric,
+                            'baseline': base[metric], 'current': entry[metric], 'change': change
+                        })
+    return regressions
+
+def bench_parallel_scaling(n_students=50000, n_sessions=20, worker_counts=(1, 2, 4, 8), seed=42):
+    # Wall time of analyze_all per worker count on one synthetic cohort
+    students_df, logs_df = generate_mock_data(n_students=n_students, n_sessions=n_sessions, seed=seed, bulk=True)
+    analyzer = CognitiveAnalyzer()
+    results = []
+    baseline = None
+    for workers in worker_counts:
+        seconds, _ = time_call(analyzer.analyze_all, students_df, logs_df, workers=workers)
+        baseline = baseline or seconds
+        results.append({
+            'workers': workers,
+            'students': n_students,
+            'log_rows': len(logs_df),
+            'seconds': seconds,
+            'speedup': baseline / seconds
+        })
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CogniLearn performance benchmarks")
+    parser.add_argument("suite", nargs="?", choices=["pipeline", "parallel"], default="pipeline")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=['50', '5k'])
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak-memory runs")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON to flag regressions against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--students", type=int, default=50000, help="cohort size for the parallel suite")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args(argv)
+
+    if args.suite == "parallel":
+        results = bench_parallel_scaling(args.students, worker_counts=args.workers)
+        print(f"cpu_count={os.cpu_count()}")
+        for row in results:
+            print(json.dumps(row))
+        return 0
+
+    report = run_benchmarks({label: SCALES[label] for label in args.scales}, memory=not args.no_memory)
+    for scale, benchmarks in report['results'].items():
+        for name, entry in benchmarks.items():
+            if not name.startswith('_'):
+                memory = f"{entry['peak_mb']:9.1f} MB" if 'peak_mb' in entry else ""
+                print(f"{scale:>5} {name:<26} {entry['seconds']:9.4f} s {memory}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['scale']} {r['benchmark']} {r['metric']}: "
+                  f"{r['baseline']:.4f} -> {r['current']:.4f} (+{r['change']:.0%})")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+# Server-side summaries for figures over many students: each returns a fixed number of
+# values per group, so the figure JSON no longer grows with the cohort
+
+def histogram(values, bins=10):
+    # (bin centers, bin widths, counts)
+    values = np.asarray(values, dtype=np.float64)
+    counts, edges = np.histogram(values[~np.isnan(values)], bins=bins)
+    return (edges[:-1] + edges[1:]) / 2, np.diff(edges), counts
+
+def box_stats(frame, group, column):
+    # One row per group with the quartiles and Tukey whiskers plotly draws for a box:
+    # whiskers end at the furthest points within 1.5 IQR of the box
+    rows = []
+    for name, values in frame.groupby(group, sort=False, observed=True)[column]:
+        v = np.sort(values.to_numpy(dtype=np.float64))
+        q1, median, q3 = np.percentile(v, [25, 50, 75])
+        iqr = q3 - q1
+        inside = v[(v >= q1 - 1.5 * iqr) & (v <= q3 + 1.5 * iqr)]
+        rows.append({
+            group: name, 'q1': q1, 'median': median, 'q3': q3, 'mean': v.mean(),
+            'lowerfence': inside[0], 'upperfence': inside[-1],
+            'outliers': len(v) - len(inside), 'count': len(v)
+        })
+    return pd.DataFrame(rows)
+
+def bin_2d(frame, x, y, group, bins=40):
+    # Points snapped to a bins x bins grid shared by every group; one row per occupied
+    # (group, cell) with the cell center and the number of students in it
+    xs = frame[x].to_numpy(dtype=np.float64)
+    ys = frame[y].to_numpy(dtype=np.float64)
+    x_edges = np.linspace(xs.min(), xs.max(), bins + 1)
+    y_edges = np.linspace(ys.min(), ys.max(), bins + 1)
+    xi = np.clip(np.searchsorted(x_edges, xs, side='right') - 1, 0, bins - 1)
+    yi = np.clip(np.searchsorted(y_edges, ys, side='right') - 1, 0, bins - 1)
+    cells = pd.DataFrame({group: frame[group].to_numpy(), 'xi': xi, 'yi': yi})
+    counts = cells.groupby([group, 'xi', 'yi'], sort=False, observed=True).size().reset_index(name='count')
+    counts[x] = (x_edges[counts['xi']] + x_edges[counts['xi'] + 1]) / 2
+    counts[y] = (y_edges[counts['yi']] + y_edges[counts['yi'] + 1]) / 2
+    return counts[[group, x, y, 'count']]
@@ -0,0 +1,63 @@
+import numpy as np
+
+class NearestProfileClassifier:
+    def __init__(self, profiles, metric="euclidean", weights=None, temperature=0.1, chunk_size=65536):
+        # profiles: {pattern name: profile vector}, all in the same normalized feature space
+        if metric not in ("euclidean", "weighted_euclidean", "cosine"):
+            raise ValueError(f"Unknown distance metric: {metric}")
+        if metric == "weighted_euclidean" and weights is None:
+            raise ValueError("weighted_euclidean needs a weights vector")
+
+        self.labels = np.array(list(profiles.keys()), dtype=object)
+        self.centers = np.vstack([np.asarray(p, dtype=np.float64) for p in profiles.values()])
+        self.metric = metric
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+        self.temperature = temperature
+        self.chunk_size = chunk_size
+
+    def distances(self, X):
+        # Full (rows x profiles) distance matrix, filled one chunk at a time
+        X = np.asarray(X, dtype=np.float64)
+        out = np.empty((len(X), len(self.centers)), dtype=np.float64)
+        for start in range(0, len(X), self.chunk_size):
+            stop = start + self.chunk_size
+            out[start:stop] = self._chunk_distances(X[start:stop])
+        return out
+
+    def _chunk_distances(self, chunk):
+        if self.metric == "cosine":
+            dots = chunk @ self.centers.T
+            norms = np.linalg.norm(chunk, axis=1)[:, None] * np.linalg.norm(self.centers, axis=1)[None, :]
+            # An all-zero row has no direction; treat it as orthogonal to every profile
+            with np.errstate(invalid="ignore", divide="ignore"):
+                sims = np.where(norms > 0, dots / norms, 0.0)
+            return 1.0 - sims
+
+        diff = chunk[:, None, :] - self.centers[None, :, :]
+        sq = diff * diff
+        if self.metric == "weighted_euclidean":
+            sq = sq * self.weights
+        return np.sqrt(sq.sum(axis=2))
+
+    def confidences(self, distances):
+        # Soft assignment: softmax over negative distances
+        logits = -distances / self.temperature
+        logits -= logits.max(axis=1, keepdims=True)
+        weights = np.exp(logits)
+        return weights / weights.sum(axis=1, keepdims=True)
+
+    def classify(self, X):
+        # Returns (labels, distance matrix, confidence matrix); ties go to the first profile.
+        # Temporaries only ever cover one chunk of rows.
+        X = np.asarray(X, dtype=np.float64)
+        n = len(X)
+        best = np.empty(n, dtype=np.intp)
+        dist = np.empty((n, len(self.centers)), dtype=np.float64)
+        conf = np.empty_like(dist)
+        for start in range(0, n, self.chunk_size):
+            stop = start + self.chunk_size
+            d = self._chunk_distances(X[start:stop])
+            dist[start:stop] = d
+            best[start:stop] = d.argmin(axis=1)
+            conf[start:stop] = self.confidences(d)
+        return self.labels[best], dist, conf
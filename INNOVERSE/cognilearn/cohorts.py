@@ -0,0 +1,110 @@
+import glob
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from columnar_store import ColumnStore
+from context import DataContext
+
+def load_cohort_directory(path):
+    # Reads a cohort written by data_generator.write_mock_data: students/ and logs/
+    # folders of CSV or Parquet part files
+    def read_parts(table):
+        parts = sorted(glob.glob(os.path.join(path, table, "part-*.*")))
+        if not parts:
+            raise FileNotFoundError(f"No {table} part files under {path}")
+        reader = pd.read_parquet if parts[0].endswith(".parquet") else pd.read_csv
+        return pd.concat([reader(p) for p in parts], ignore_index=True)
+    return read_parts("students"), read_parts("logs")
+
+class CohortRegistry:
+    # One DataContext per cohort (school), each with its own artifacts and figure cache.
+    # Contexts are created on first selection; when resident cohorts exceed the memory
+    # budget the least recently used ones are dropped and rebuilt on their next visit.
+    # With refresh_interval set, every resident context rebuilds its snapshot on a
+    # background worker instead of in the callbacks. An optional ResultCache is shared
+    # by every context.
+    def __init__(self, memory_budget_bytes=2 * 1024 ** 3, refresh_interval=None, result_cache=None):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.refresh_interval = refresh_interval
+        self.result_cache = result_cache
+        self.loaders = {}
+        self.metrics_loaders = {}
+        self._contexts = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def register(self, name, loader, metrics_loader=None):
+        self.loaders[name] = loader
+        self.metrics_loaders[name] = metrics_loader
+
+    def register_store(self, name, path):
+        # Memory-mapped column store; precomputed metrics are used when it has them
+        store = ColumnStore(path)
+        metrics_loader = (lambda: store.table('metrics')) if 'metrics' in store else None
+        self.register(name, store.data, metrics_loader)
+
+    def register_directory(self, root):
+        # Every sub-directory of root holding a column store, or students/ and logs/
+        # part files, becomes a cohort
+        for entry in sorted(os.listdir(root)):
+            path = os.path.join(root, entry)
+            if ColumnStore.is_store(path):
+                self.register_store(entry, path)
+            elif os.path.isdir(os.path.join(path, "students")) and os.path.isdir(os.path.join(path, "logs")):
+                self.register(entry, lambda path=path: load_cohort_directory(path))
+
+    def names(self):
+        return list(self.loaders)
+
+    def resident(self):
+        return list(self._contexts)
+
+    def resident_contexts(self):
+        # (name, context) pairs without touching the LRU order, e.g. for monitoring
+        return list(self._contexts.items())
+
+    def get(self, name):
+        if name not in self.loaders:
+            raise KeyError(f"Unknown cohort: {name}")
+        with self._lock:
+            ctx = self._contexts.get(name)
+            if ctx is None:
+                ctx = DataContext(loader=self.loaders[name], metrics_loader=self.metrics_loaders[name],
+                                  result_cache=self.result_cache)
+                self._contexts[name] = ctx
+                if self.refresh_interval:
+                    ctx.start_background_refresh(self.refresh_interval)
+            self._contexts.move_to_end(name)
+            self._enforce_budget(keep=name)
+        return ctx
+
+    def unregister(self, name):
+        self.evict(name)
+        self.loaders.pop(name, None)
+        self.metrics_loaders.pop(name, None)
+
+    def evict(self, name):
+        with self._lock:
+            ctx = self._contexts.pop(name, None)
+        if ctx is None:
+            return False
+        ctx.stop_background_refresh()
+        return True
+
+    def memory_bytes(self):
+        return sum(ctx.memory_bytes() for ctx in list(self._contexts.values()))
+
+    def _enforce_budget(self, keep):
+        usage = {name: ctx.memory_bytes() for name, ctx in self._contexts.items()}
+        total = sum(usage.values())
+        for name in list(self._contexts):
+            if total <= self.memory_budget_bytes:
+                break
+            if name == keep:
+                continue
+            self._contexts.pop(name).stop_background_refresh(wait=False)
+            total -= usage[name]
+            self.evictions += 1
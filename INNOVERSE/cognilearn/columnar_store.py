@@ -0,0 +1,167 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+STORE_VERSION = 1
+MANIFEST = "manifest.json"
+
+# Per-table column encodings; columns not listed keep their numeric dtype, and
+# string / categorical columns are always dictionary encoded. 'narrow' integers are
+# stored in the smallest dtype that holds the column's actual min and max.
+TABLE_ENCODINGS = {
+    'logs': {
+        'session': 'narrow',
+        'response_time': np.float32,
+        'correct': 'bits',
+        'retried': 'bits'
+    }
+}
+
+def _code_dtype(n_values):
+    # The code width pandas itself keeps for a categorical of this size, so wrapping
+    # the memory-mapped codes in a Categorical does not copy them
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_values < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+def _narrow_dtype(values):
+    if not len(values) or not np.issubdtype(values.dtype, np.integer):
+        return values.dtype
+    return np.result_type(np.min_scalar_type(values.min()), np.min_scalar_type(values.max()))
+
+def _is_dictionary_column(series):
+    return isinstance(series.dtype, pd.CategoricalDtype) or not (
+        pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)
+    )
+
+def _dictionary_array(index):
+    values = index.to_numpy()
+    # np.load cannot memory-map object arrays, so strings are stored fixed-width
+    return values.astype(str) if values.dtype == object else values
+
+def write_store(path, tables):
+    # tables: {name: DataFrame}. Each column becomes one .npy file under path; string
+    # columns become integer codes into a dictionary shared by every table that has a
+    # column of that name, so e.g. student_id codes line up across logs and metrics.
+    os.makedirs(path, exist_ok=True)
+    dictionaries = {}
+    pending = []
+    manifest = {'version': STORE_VERSION, 'tables': {}, 'dictionaries': {}}
+
+    for table, frame in tables.items():
+        encodings = TABLE_ENCODINGS.get(table, {})
+        columns = []
+        for i, column in enumerate(frame.columns):
+            series = frame[column]
+            file_name = f"{table}-{i:03d}.npy"
+            entry = {'name': column, 'file': file_name}
+            if _is_dictionary_column(series):
+                codes, uniques = pd.factorize(series, sort=False)
+                uniques = pd.Index(np.asarray(uniques))
+                dictionary = dictionaries.get(column, uniques[:0])
+                unseen = uniques[dictionary.get_indexer(uniques) < 0]
+                if len(unseen):
+                    dictionary = dictionary.append(unseen)
+                dictionaries[column] = dictionary
+                remap = dictionary.get_indexer(uniques)
+                entry.update(encoding='dictionary', dictionary=column)
+                # Codes are written once the dictionary is final and its code width known
+                pending.append((file_name, column, np.where(codes >= 0, remap[np.maximum(codes, 0)], -1)))
+            elif encodings.get(column) == 'bits':
+                entry.update(encoding='bits')
+                np.save(os.path.join(path, file_name), np.packbits(series.to_numpy() != 0))
+            else:
+                entry.update(encoding='array')
+                values = series.to_numpy()
+                dtype = _narrow_dtype(values) if encodings.get(column) == 'narrow' else encodings.get(column)
+                np.save(os.path.join(path, file_name), values.astype(dtype, copy=False))
+            columns.append(entry)
+        manifest['tables'][table] = {'rows': len(frame), 'columns': columns}
+
+    for file_name, column, codes in pending:
+        np.save(os.path.join(path, file_name), codes.astype(_code_dtype(len(dictionaries[column]))))
+    for column, dictionary in dictionaries.items():
+        file_name = f"dictionary-{len(manifest['dictionaries']):03d}.npy"
+        np.save(os.path.join(path, file_name), _dictionary_array(dictionary))
+        manifest['dictionaries'][column] = file_name
+
+    with open(os.path.join(path, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=1)
+    return path
+
+def build_store(path, students_df, logs_df, analyzer=None):
+    # Writes students, logs and the analyzed metrics, so a dashboard opening the store
+    # can skip the analysis entirely
+    from analyzer import CognitiveAnalyzer
+    analyzer = analyzer or CognitiveAnalyzer()
+    metrics_df = analyzer.analyze_all(students_df, logs_df)
+    return write_store(path, {'students': students_df, 'logs': logs_df, 'metrics': metrics_df})
+
+class ColumnStore:
+    # Read side of write_store. Column files are opened with np.load(mmap_mode='r'), so
+    # every process opening the same store shares one page-cached copy and only the
+    # pages a computation touches are read. Tables come back as DataFrames viewing the
+    # mapped arrays; only bit-packed columns are expanded (to one bool per row).
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported store version in {path}: {self.manifest.get('version')}")
+        self._dictionaries = {}
+
+    @staticmethod
+    def is_store(path):
+        return os.path.isfile(os.path.join(path, MANIFEST))
+
+    def __contains__(self, table):
+        return table in self.manifest['tables']
+
+    def tables(self):
+        return list(self.manifest['tables'])
+
+    def _map(self, file_name):
+        # A plain ndarray view of the mapping, so frames built on it behave like any other
+        return np.asarray(np.load(os.path.join(self.path, file_name), mmap_mode='r'))
+
+    def dictionary(self, column):
+        if column not in self._dictionaries:
+            self._dictionaries[column] = pd.Index(self._map(self.manifest['dictionaries'][column]))
+        return self._dictionaries[column]
+
+    def table(self, name):
+        spec = self.manifest['tables'][name]
+        columns = {}
+        for entry in spec['columns']:
+            values = self._map(entry['file'])
+            if entry['encoding'] == 'dictionary':
+                values = pd.Categorical.from_codes(values, categories=self.dictionary(entry['dictionary']))
+            elif entry['encoding'] == 'bits':
+                values = np.unpackbits(values, count=spec['rows']).view(bool)
+            columns[entry['name']] = values
+        return pd.DataFrame(columns, copy=False)
+
+    def data(self):
+        # (students_df, logs_df), the same shape DataContext loaders return
+        return self.table('students'), self.table('logs')
+
+    def nbytes(self):
+        return sum(
+            os.path.getsize(os.path.join(self.path, f)) for f in os.listdir(self.path) if f.endswith(".npy")
+        )
+
+if __name__ == "__main__":
+    import argparse
+    from data_generator import generate_mock_data
+
+    parser = argparse.ArgumentParser(description="Write a synthetic cohort as a memory-mapped column store")
+    parser.add_argument("path")
+    parser.add_argument("--students", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+    students_df, logs_df = generate_mock_data(n_students=args.students, n_sessions=args.sessions, bulk=True)
+    build_store(args.path, students_df, logs_df)
+    print(f"Wrote {len(students_df)} students and {len(logs_df)} logs to {args.path}")
@@ -0,0 +1,338 @@
+import queue
+import threading
+import time
+import traceback
+
+import pandas as pd
+
+from aggregates import AggregateCache
+from analyzer import CognitiveAnalyzer
+from data_generator import generate_mock_data
+from figure_cache import FigureCache
+from recommender import RecommendationEngine
+from report_generator import ReportAccumulator
+from result_cache import fingerprint
+from schema import append_logs, compact_data
+from streaming import StreamingAnalyzer
+from student_search import StudentSearchIndex
+from table_index import PriorityTableIndex
+
+# Artifacts a Snapshot derives from its own frames, built on first use or by complete()
+SNAPSHOT_ARTIFACTS = ('recs_df', 'aggregates', 'table_index', 'student_search')
+
+class Snapshot:
+    # One data version of everything the dashboard shows, never changed once published.
+    # metrics_df and report_data are computed when the snapshot is made; the rest only
+    # read the snapshot's own frames, so building them lazily cannot mix versions.
+    def __init__(self, context, version, students_df, logs_df, metrics_df, report_data, recs_df=None):
+        self.version = version
+        self.students_df = students_df
+        self.logs_df = logs_df
+        self.metrics_df = metrics_df
+        self.report_data = report_data
+        self.analyzer = context.analyzer
+        self.recommender = context.recommender
+        self.figure_cache = context.figure_cache
+        self.built_at = time.time()
+        self.build_seconds = 0.0
+        self.timings = {}
+        self._artifacts = {} if recs_df is None else {'recs_df': recs_df}
+        self._lock = threading.RLock()
+
+    def _get(self, name, build):
+        value = self._artifacts.get(name)
+        if value is None:
+            with self._lock:
+                value = self._artifacts.get(name)
+                if value is None:
+                    start = time.perf_counter()
+                    value = build()
+                    self.timings[name] = time.perf_counter() - start
+                    self._artifacts[name] = value
+        return value
+
+    def is_built(self, name):
+        return name in ('metrics_df', 'report_data') or name in self._artifacts
+
+    def complete(self):
+        for name in SNAPSHOT_ARTIFACTS:
+            getattr(self, name)
+        return self
+
+    @property
+    def recs_df(self):
+        return self._get('recs_df', lambda: self.recommender.get_all_recommendations(self.metrics_df))
+
+    @property
+    def aggregates(self):
+        return self._get('aggregates', lambda: AggregateCache(
+            self.logs_df, self.metrics_df, self.version, self.analyzer.temporal_window, self.analyzer.forgetting_drop
+        ))
+
+    @property
+    def table_index(self):
+        return self._get('table_index', lambda: PriorityTableIndex(self.recs_df, self.metrics_df))
+
+    @property
+    def student_search(self):
+        return self._get('student_search', lambda: StudentSearchIndex(self.metrics_df))
+
+    def frames(self):
+        frames = [self.metrics_df] + [v for v in self._artifacts.values() if isinstance(v, pd.DataFrame)]
+        aggregates = self._artifacts.get('aggregates')
+        if aggregates is not None and 'log_store' in aggregates.__dict__:
+            frames.append(aggregates.log_store.logs_df)
+        return frames
+
+class DataContext:
+    # Everything the dashboard shows, computed on first access instead of at import time.
+    # The loaded frames and the streaming state are mutable and updated by refresh();
+    # what callbacks read comes from an immutable Snapshot of one data version. Without
+    # a background worker a stale snapshot is rebuilt on the next access; with one
+    # (start_background_refresh) it is rebuilt off the request path and swapped in
+    # whole, so callbacks keep serving the previous snapshot until then.
+    def __init__(self, loader=generate_mock_data, metrics_loader=None, result_cache=None):
+        self.loader = loader
+        # Optional precomputed metrics (e.g. from a columnar_store), used until the
+        # first refresh() changes the logs they were computed from
+        self.metrics_loader = metrics_loader
+        # Optional result_cache.ResultCache: the first snapshot of loaded data is looked
+        # up by fingerprint and stored after a miss, so a restart on unchanged data skips
+        # the pipeline. Versions produced by refresh() are not cached.
+        self.result_cache = result_cache
+        self.analyzer = CognitiveAnalyzer()
+        self.recommender = RecommendationEngine()
+        # New answer events (dicts with the logs_df columns) are pushed here, e.g. by
+        # streaming.tail_csv, and folded in on the next refresh()
+        self.event_queue = queue.Queue()
+        self.figure_cache = FigureCache()
+        self.version = 0
+        self.timings = {}
+        self.last_error = None
+        self._artifacts = {}
+        self._snapshot = None
+        self._lock = threading.RLock()
+        self._memory = None
+        self._worker = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def _get(self, name, build):
+        value = self._artifacts.get(name)
+        if value is None:
+            with self._lock:
+                value = self._artifacts.get(name)
+                if value is None:
+                    start = time.perf_counter()
+                    value = build()
+                    self.timings[name] = time.perf_counter() - start
+                    self._artifacts[name] = value
+        return value
+
+    def is_built(self, name):
+        snapshot = self._snapshot
+        return name in self._artifacts or (snapshot is not None and snapshot.is_built(name))
+
+    # ----------------- Artifacts ----------------- #
+    @property
+    def data(self):
+        # Loaded frames are converted to the compact schema once, on the way in
+        return self._get('data', lambda: compact_data(self.loader()))
+
+    @property
+    def students_df(self):
+        return self.data[0]
+
+    @property
+    def logs_df(self):
+        return self._get('logs_df', lambda: self.data[1])
+
+    @property
+    def stream(self):
+        return self._get('stream', lambda: StreamingAnalyzer(self.analyzer, self.students_df, self.logs_df))
+
+    @property
+    def cache_key(self):
+        # Fingerprint of the loaded data; refresh() does not change it
+        return self._get('cache_key', lambda: fingerprint(self.students_df, self.logs_df, self.analyzer))
+
+    @property
+    def report_accumulator(self):
+        # Survives refresh(): new logs are folded into it instead of rescanning logs_df
+        def build():
+            accumulator = ReportAccumulator()
+            accumulator.add_logs(self.logs_df)
+            return accumulator
+        return self._get('report_accumulator', build)
+
+    # ----------------- Snapshots ----------------- #
+    @property
+    def snapshot(self):
+        # The latest published snapshot. Only the first one, or a stale one when no
+        # worker is running, is built on the calling thread.
+        snapshot = self._snapshot
+        if snapshot is None or (snapshot.version != self.version and not self.background_running):
+            snapshot = self.build_snapshot()
+        return snapshot
+
+    @property
+    def published_snapshot(self):
+        # The current snapshot without building one, e.g. for monitoring
+        return self._snapshot
+
+    def build_snapshot(self, complete=False):
+        start = time.perf_counter()
+        with self._lock:
+            # Reads the mutable state, so refresh() must not run in between
+            cacheable = self.result_cache is not None and self.metrics_loader is None and self.version == 0
+            cached = self.result_cache.load(self.cache_key) if cacheable else None
+            if cached is not None:
+                metrics_df, recs_df, report_data = cached
+            else:
+                if self.metrics_loader is not None and self.version == 0:
+                    metrics_df = self._get('loaded_metrics', self.metrics_loader)
+                else:
+                    metrics_df = self.stream.metrics_df()
+                accumulator = self.report_accumulator
+                accumulator.update_metrics(metrics_df)
+                recs_df, report_data = None, accumulator.report_data()
+            snapshot = Snapshot(self, self.version, self.students_df, self.logs_df,
+                                metrics_df, report_data, recs_df)
+        if complete:
+            snapshot.complete()
+        if cacheable and cached is None:
+            try:
+                self.result_cache.store(self.cache_key, metrics_df, snapshot.recs_df, report_data)
+            except OSError as e:
+                # The cache only saves time; a full or read-only disk is not fatal
+                self.last_error = repr(e)
+        snapshot.build_seconds = time.perf_counter() - start
+        with self._lock:
+            # One reference assignment: readers hold either the old snapshot or the new
+            # one. A slower build of an older version never replaces a newer one.
+            if self._snapshot is None or snapshot.version >= self._snapshot.version:
+                self._snapshot = snapshot
+                self.timings['snapshot'] = snapshot.build_seconds
+        return self._snapshot
+
+    # The dashboard's artifacts, read from the current snapshot
+    @property
+    def metrics_df(self):
+        return self.snapshot.metrics_df
+
+    @property
+    def recs_df(self):
+        return self.snapshot.recs_df
+
+    @property
+    def report_data(self):
+        return self.snapshot.report_data
+
+    @property
+    def aggregates(self):
+        return self.snapshot.aggregates
+
+    @property
+    def table_index(self):
+        return self.snapshot.table_index
+
+    @property
+    def student_search(self):
+        return self.snapshot.student_search
+
+    def memory_bytes(self):
+        # Approximate resident size of the built frames, recomputed only when the set of
+        # built artifacts or the published snapshot changes
+        snapshot = self._snapshot
+        key = (self.version, tuple(sorted(self._artifacts)), id(snapshot),
+               snapshot and tuple(sorted(snapshot._artifacts)))
+        if self._memory is None or self._memory[0] != key:
+            frames = [v for v in self._artifacts.values() if isinstance(v, pd.DataFrame)]
+            if 'data' in self._artifacts:
+                frames.append(self.students_df)
+            if snapshot is not None:
+                frames += [f for f in snapshot.frames() if all(f is not g for g in frames)]
+            self._memory = (key, sum(int(f.memory_usage(deep=True).sum()) for f in frames))
+        return self._memory[1] + self.figure_cache.stats()['bytes']
+
+    # ----------------- Updates ----------------- #
+    def refresh(self):
+        # Folds queued events into the logs and bumps the data version; the snapshot
+        # for the new version is built separately
+        if self.event_queue.empty():
+            return False
+        with self._lock:
+            new_logs = self.stream.drain(self.event_queue)
+            if len(new_logs) == 0:
+                return False
+            logs_df = append_logs(self.logs_df, new_logs)
+            if self.is_built('report_accumulator'):
+                self._artifacts['report_accumulator'].add_logs(new_logs)
+            self._artifacts['logs_df'] = logs_df
+            self._artifacts['data'] = (self.students_df, logs_df)
+            self.version += 1
+        return True
+
+    def request_refresh(self):
+        # For callbacks: with a worker running this only wakes it, so the request never
+        # waits on the pipeline
+        if not self.background_running:
+            return self.refresh()
+        if not self.event_queue.empty():
+            self._wake.set()
+        return False
+
+    @property
+    def background_running(self):
+        return self._worker is not None and self._worker.is_alive()
+
+    def start_background_refresh(self, interval=2.0):
+        # Rebuilds the snapshot every interval seconds, or as soon as request_refresh()
+        # sees new events, and publishes it only once every artifact is built
+        if self.background_running:
+            return self._worker
+        self._stop.clear()
+        def run():
+            while not self._stop.is_set():
+                self._wake.wait(interval)
+                self._wake.clear()
+                if self._stop.is_set():
+                    break
+                try:
+                    self.refresh()
+                    snapshot = self._snapshot
+                    if snapshot is None or snapshot.version != self.version:
+                        self.build_snapshot(complete=True)
+                except Exception as e:
+                    # Keep serving the last good snapshot and try again next round
+                    self.last_error = repr(e)
+                    traceback.print_exc()
+        self._worker = threading.Thread(target=run, name="cognilearn-refresh", daemon=True)
+        self._worker.start()
+        return self._worker
+
+    def stop_background_refresh(self, wait=True):
+        # wait=False only signals the worker, which exits after any build in progress
+        worker = self._worker
+        if worker is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        if wait and worker is not threading.current_thread():
+            worker.join()
+        self._worker = None
+
+    def warm_up(self, background=True):
+        # Builds the first complete snapshot ahead of the first request; in the
+        # background by default so the server can start listening straight away
+        def build_all():
+            if self._snapshot is None or self._snapshot.version != self.version:
+                self.build_snapshot(complete=True)
+            else:
+                self._snapshot.complete()
+        if not background:
+            build_all()
+            return None
+        thread = threading.Thread(target=build_all, name="cognilearn-warm-up", daemon=True)
+        thread.start()
+        return thread
@@ -1,25 +1,40 @@
 import pandas as pd
 import numpy as np
 import random
+import os
 
-def generate_mock_data():
-    np.random.seed(42)
-    random.seed(42)
+# Students per independently seeded block in bulk/streamed generation
+BLOCK_SIZE = 1000
 
-    subjects = ["Algebra", "Geometry", "Statistics", "Logic", "Calculus"]
-    archetypes = ["Visual Learner", "Analytical Thinker", "Kinesthetic Learner", "Social Collaborator", "Mixed Learner"]
-    
-    first_names = ["Emma", "Liam", "Olivia", "Noah", "Ava", "Oliver", "Isabella", "Elijah", "Sophia", "William",
+SUBJECTS = ["Algebra", "Geometry", "Statistics", "Logic", "Calculus"]
+ARCHETYPES = ["Visual Learner", "Analytical Thinker", "Kinesthetic Learner", "Social Collaborator", "Mixed Learner"]
+
+FIRST_NAMES = ["Emma", "Liam", "Olivia", "Noah", "Ava", "Oliver", "Isabella", "Elijah", "Sophia", "William",
                    "Mia", "James", "Charlotte", "Benjamin", "Amelia", "Lucas", "Harper", "Henry", "Evelyn", "Alexander",
                    "Abigail", "Mason", "Emily", "Michael", "Elizabeth", "Ethan", "Mila", "Daniel", "Ella", "Jacob",
                    "Avery", "Logan", "Sofia", "Jackson", "Camila", "Levi", "Aria", "Sebastian", "Scarlett", "Mateo",
                    "Victoria", "Jack", "Madison", "Owen", "Luna", "Theodore", "Grace", "Aiden", "Chloe", "Samuel"]
 
+def _student_name(i):
+    # Cycle through the first names, numbering repeats once the list runs out
+    name = FIRST_NAMES[i % len(FIRST_NAMES)]
+    return name if i < len(FIRST_NAMES) else f"{name} {i // len(FIRST_NAMES) + 1}"
+
+def generate_mock_data(n_students=50, n_sessions=20, subjects=None, seed=42, bulk=False):
+    if bulk:
+        return generate_bulk_data(n_students, n_sessions, subjects, seed)
+
+    np.random.seed(seed)
+    random.seed(seed)
+
+    subjects = SUBJECTS if subjects is None else subjects
+    archetypes = ARCHETYPES
+
     # 1. Generate Students
     students = []
-    for i in range(50):
+    for i in range(n_students):
         student_id = f"STU{i+1:03d}"
-        name = first_names[i]
+        name = _student_name(i)
         grade = np.random.randint(6, 13)
         base_archetype = np.random.choice(archetypes)
         students.append({
@@ -36,7 +51,7 @@ def generate_mock_data():
         student_id = student['student_id']
         base_arch = student['base_archetype']
         
-        for session in range(1, 21):
+        for session in range(1, n_sessions + 1):
             num_questions = np.random.randint(8, 16)
             
             for q_idx in range(num_questions):
@@ -44,7 +59,7 @@ def generate_mock_data():
                 
                 # Learning curve logic base
                 # Session 1..20 maps to increasing accuracy and decreasing time
-                progress_factor = session / 20.0
+                progress_factor = session / n_sessions
                 
                 # Base probability of being correct increases over sessions
                 base_accuracy_prob = 0.5 + (0.35 * progress_factor)
@@ -52,7 +67,7 @@ def generate_mock_data():
                 # Modify by archetype slightly
                 if base_arch == "Analytical Thinker":
                     base_accuracy_prob += 0.05
-                elif base_arch == "Kinesthetic Learner" and session > 10:
+                elif base_arch == "Kinesthetic Learner" and session > n_sessions / 2:
                     base_accuracy_prob += 0.1  # Fast improvement later
                     
                 base_accuracy_prob = min(0.98, max(0.1, base_accuracy_prob))
@@ -95,6 +110,122 @@ def generate_mock_data():
     
     return students_df, logs_df
 
+def _generate_block(rng, first_index, n_students, n_sessions, subjects):
+    # Same archetype logic as the loop above, drawn for every question of the block at once
+    analytical = ARCHETYPES.index("Analytical Thinker")
+    kinesthetic = ARCHETYPES.index("Kinesthetic Learner")
+
+    grades = rng.integers(6, 13, n_students)
+    arch = rng.integers(0, len(ARCHETYPES), n_students)
+    num_questions = rng.integers(8, 16, (n_students, n_sessions))
+
+    # One row per question: expand (student, session) pairs by their question counts
+    pair = np.repeat(np.arange(n_students * n_sessions), num_questions.ravel())
+    student_idx = pair // n_sessions
+    # One byte while session numbers fit, wider beyond 127 sessions
+    session_dtype = next(t for t in (np.int8, np.int16, np.int32, np.int64) if n_sessions <= np.iinfo(t).max)
+    session = (pair % n_sessions + 1).astype(session_dtype)
+    n_rows = len(pair)
+
+    q_arch = arch[student_idx]
+    is_analytical = q_arch == analytical
+    is_kinesthetic = q_arch == kinesthetic
+
+    subject_idx = rng.integers(0, len(subjects), n_rows)
+
+    # Learning curve logic base
+    progress_factor = session / n_sessions
+    base_accuracy_prob = 0.5 + (0.35 * progress_factor)
+    base_accuracy_prob += 0.05 * is_analytical
+    base_accuracy_prob += 0.1 * (is_kinesthetic & (session > n_sessions / 2))
+    base_accuracy_prob = np.clip(base_accuracy_prob, 0.1, 0.98)
+    correct = rng.random(n_rows) < base_accuracy_prob
+
+    base_time = 45.0 - (15.0 * progress_factor) + 10.0 * is_analytical - 5.0 * is_kinesthetic
+    response_time = np.maximum(5.0, rng.normal(base_time, 5.0))
+
+    retry_prob = np.where(correct, 0.1, 0.6) + 0.2 * is_kinesthetic
+    retried = rng.random(n_rows) < retry_prob
+
+    score = np.where(correct, 10, np.where(retried, 5, 0))
+
+    return {
+        "grade": grades.astype(np.int8),
+        "archetype": arch,
+        "student_idx": student_idx + first_index,
+        "session": session,
+        "subject_idx": subject_idx,
+        "response_time": response_time.astype(np.float32),
+        "correct": correct.astype(np.int8),
+        "retried": retried.astype(np.int8),
+        "score": score.astype(np.int8)
+    }
+
+def _block_frames(block, first_index, n_students, subjects):
+    # Student ids become categories covering exactly [first_index, first_index + n_students)
+    ids = [f"STU{i+1:03d}" for i in range(first_index, first_index + n_students)]
+    students_df = pd.DataFrame({
+        "student_id": pd.Categorical(ids, categories=ids),
+        "name": [_student_name(i) for i in range(first_index, first_index + n_students)],
+        "grade": block["grade"],
+        "base_archetype": pd.Categorical.from_codes(block["archetype"], categories=ARCHETYPES)
+    })
+    logs_df = pd.DataFrame({
+        "student_id": pd.Categorical.from_codes(block["student_idx"] - first_index, categories=ids),
+        "session": block["session"],
+        "subject": pd.Categorical.from_codes(block["subject_idx"], categories=subjects),
+        "response_time": block["response_time"],
+        "correct": block["correct"],
+        "retried": block["retried"],
+        "score": block["score"]
+    })
+    return students_df, logs_df
+
+def _iter_blocks(n_students, n_sessions, subjects, seed, block_size):
+    # Each block of students has its own stream seeded from (seed, block number), so the
+    # data for a block never depends on how many blocks are generated around it
+    for block_no, first_index in enumerate(range(0, n_students, block_size)):
+        size = min(block_size, n_students - first_index)
+        rng = np.random.default_rng([seed, block_no])
+        yield first_index, size, _generate_block(rng, first_index, size, n_sessions, subjects)
+
+def iter_mock_data(n_students=50, n_sessions=20, subjects=None, seed=42, block_size=BLOCK_SIZE):
+    # Yields (students_df, logs_df) one block of students at a time; concatenating the
+    # chunks gives exactly generate_bulk_data() for the same seed and block_size
+    subjects = SUBJECTS if subjects is None else list(subjects)
+    for first_index, size, block in _iter_blocks(n_students, n_sessions, subjects, seed, block_size):
+        yield _block_frames(block, first_index, size, subjects)
+
+def generate_bulk_data(n_students=50, n_sessions=20, subjects=None, seed=42, block_size=BLOCK_SIZE):
+    # Vectorized generator for load-test fixtures; seeded through np.random.Generator
+    if n_students < 1:
+        raise ValueError(f"n_students must be at least 1, got {n_students}")
+    subjects = SUBJECTS if subjects is None else list(subjects)
+    blocks = [block for _, _, block in _iter_blocks(n_students, n_sessions, subjects, seed, block_size)]
+    merged = {key: np.concatenate([b[key] for b in blocks]) for key in blocks[0]}
+    return _block_frames(merged, 0, n_students, subjects)
+
+def write_mock_data(out_dir, fmt="csv", n_students=50, n_sessions=20, subjects=None, seed=42, block_size=BLOCK_SIZE):
+    # Streams every block to its own part file under out_dir/students and out_dir/logs,
+    # so only one block is ever held in memory. fmt="parquet" needs pyarrow or fastparquet.
+    if fmt not in ("parquet", "csv"):
+        raise ValueError(f"Unsupported output format: {fmt}")
+
+    paths = []
+    for table in ("students", "logs"):
+        os.makedirs(os.path.join(out_dir, table), exist_ok=True)
+
+    chunks = iter_mock_data(n_students, n_sessions, subjects, seed, block_size)
+    for part, (students_chunk, logs_chunk) in enumerate(chunks):
+        for table, frame in (("students", students_chunk), ("logs", logs_chunk)):
+            path = os.path.join(out_dir, table, f"part-{part:05d}.{fmt}")
+            if fmt == "parquet":
+                frame.to_parquet(path, index=False)
+            else:
+                frame.to_csv(path, index=False)
+            paths.append(path)
+    return paths
+
 if __name__ == "__main__":
     st, lg = generate_mock_data()
     print(f"Generated {len(st)} students and {len(lg)} logs.")
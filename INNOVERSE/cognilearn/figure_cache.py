@@ -0,0 +1,63 @@
+import json
+import threading
+from collections import OrderedDict
+
+class FigureCache:
+    # LRU of Plotly figures keyed by (figure name, student_id, data version), held as the
+    # plain dicts dcc.Graph takes. A miss builds the figure and converts it once (Plotly's
+    # validation and encoding); a hit returns the stored dict as is, with no decoding, so
+    # the only work left per request is Dash encoding the response. Callers must not
+    # mutate the returned dicts. Bumping the data version makes every older entry
+    # unreachable, and LRU ages them out; sizes are counted in serialized bytes.
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, name, build, student_id=None, version=0):
+        key = (name, student_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Build outside the lock so a slow figure does not block other callbacks
+        payload = build().to_json()
+        figure = json.loads(payload)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (figure, len(payload))
+                self._bytes += len(payload)
+                self._evict()
+        return figure
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,132 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from schema import compact_logs
+
+CHUNK_ROWS = 1_000_000
+# Sessions are lesson numbers; larger values are usually dates or ids in the wrong
+# column, and downstream arrays are sized by the session number
+MAX_SESSION = 1000
+
+# Explicit parse dtypes: ids and subjects as strings, everything else as float64 so
+# blanks come through as NaN and are handled by the validation below
+LOG_DTYPES = {
+    'student_id': 'str',
+    'session': 'float64',
+    'subject': 'str',
+    'response_time': 'float64',
+    'correct': 'float64',
+    'retried': 'float64',
+    'score': 'float64'
+}
+# Optional per-student columns used to build students_df
+STUDENT_DTYPES = {'name': 'str', 'grade': 'float64'}
+
+class DataValidationError(ValueError):
+    # The uploaded file cannot be used at all (missing columns, unparseable values,
+    # no valid rows); individual bad rows are dropped and counted instead
+    pass
+
+def _validate_header(columns):
+    missing = [c for c in LOG_DTYPES if c not in columns]
+    if missing:
+        raise DataValidationError(f"Missing required columns: {', '.join(missing)}")
+
+def _validate_chunk(chunk, dropped):
+    # Vectorized row checks; returns the valid rows and adds per-reason drop counts.
+    # A row is counted under the first check it fails.
+    checks = [
+        ('missing_student_id', chunk['student_id'].isna() | (chunk['student_id'].str.strip() == '')),
+        ('missing_subject', chunk['subject'].isna()),
+        ('invalid_session', ~chunk['session'].between(1, MAX_SESSION) | (chunk['session'] % 1 != 0)),
+        ('invalid_correct', ~chunk['correct'].isin([0, 1])),
+        ('invalid_retried', ~(chunk['retried'] >= 0)),
+        ('invalid_score', chunk['score'].isna())
+    ]
+    bad = np.zeros(len(chunk), dtype=bool)
+    for reason, mask in checks:
+        mask = mask.to_numpy() & ~bad
+        dropped[reason] = dropped.get(reason, 0) + int(mask.sum())
+        bad |= mask
+    return chunk[~bad]
+
+def _concat_chunks(chunks):
+    # Categorical chunks carry their own categories; union them instead of falling back
+    # to object columns, so the whole file is only ever held in compact form
+    columns = {}
+    for column in chunks[0].columns:
+        parts = [c[column] for c in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[column] = pd.api.types.union_categoricals(parts)
+        else:
+            columns[column] = np.concatenate([p.to_numpy() for p in parts])
+    return pd.DataFrame(columns)
+
+def ingest_log_csv(source, chunk_rows=CHUNK_ROWS):
+    # Reads an answer-log CSV (path or file-like) in chunks with explicit dtypes,
+    # validates and compacts each chunk as it arrives, then median-imputes missing or
+    # negative response times over the whole file. Returns (students_df, logs_df, metadata).
+    start = time.perf_counter()
+    header = pd.read_csv(source, nrows=0).columns
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    _validate_header(header)
+    student_columns = [c for c in STUDENT_DTYPES if c in header]
+
+    dtypes = LOG_DTYPES | {c: STUDENT_DTYPES[c] for c in student_columns}
+    dropped = {}
+    rows_read = 0
+    chunks = []
+    student_parts = []
+    try:
+        reader = pd.read_csv(source, usecols=list(dtypes), dtype=dtypes, chunksize=chunk_rows)
+        for chunk in reader:
+            rows_read += len(chunk)
+            chunk = _validate_chunk(chunk, dropped)
+            if student_columns:
+                student_parts.append(chunk[['student_id'] + student_columns].drop_duplicates('student_id'))
+            chunk = chunk[list(LOG_DTYPES)].assign(retried=chunk['retried'] > 0)
+            chunks.append(compact_logs(chunk))
+    except ValueError as e:
+        raise DataValidationError(f"Could not parse log file: {e}") from e
+
+    logs_df = _concat_chunks(chunks) if chunks else pd.DataFrame()
+    if len(logs_df) == 0:
+        raise DataValidationError("No valid rows in log file")
+
+    response_time = logs_df['response_time'].to_numpy()
+    missing = ~(response_time >= 0)
+    if missing.any():
+        median = np.median(response_time[~missing]) if (~missing).any() else 0.0
+        response_time = np.where(missing, median, response_time).astype(response_time.dtype)
+        logs_df['response_time'] = response_time
+
+    students_df = _students_from_logs(logs_df, student_parts)
+    metadata = {
+        'rows_read': rows_read,
+        'rows_kept': len(logs_df),
+        'rows_dropped': rows_read - len(logs_df),
+        'dropped_by_reason': {k: v for k, v in dropped.items() if v},
+        'response_time_imputed': int(missing.sum()),
+        'students': len(students_df),
+        'questions': len(logs_df),
+        'seconds': time.perf_counter() - start
+    }
+    return students_df, logs_df, metadata
+
+def _students_from_logs(logs_df, student_parts):
+    # One row per student with answers, in first-seen order; name and grade come from the
+    # optional columns when the file has them
+    ids = logs_df['student_id'].cat.remove_unused_categories()
+    order = pd.unique(ids.cat.codes.to_numpy())
+    students_df = pd.DataFrame({'student_id': ids.cat.categories[order]})
+    if student_parts:
+        info = pd.concat(student_parts).drop_duplicates('student_id').set_index('student_id')
+        students_df = students_df.join(info, on='student_id')
+    if 'name' not in students_df:
+        students_df['name'] = students_df['student_id']
+    students_df['name'] = students_df['name'].fillna(students_df['student_id'])
+    students_df['grade'] = students_df['grade'].fillna(0).astype('int64') if 'grade' in students_df else 0
+    return students_df[['student_id', 'name', 'grade']]
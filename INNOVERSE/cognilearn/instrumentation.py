@@ -0,0 +1,177 @@
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in seconds, from fast cache hits to full rebuilds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(self.buckets) and seconds > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += seconds
+        self.count += 1
+
+class SamplingProfiler:
+    # Samples one thread's Python stack every interval seconds from a background thread
+    # and counts folded stacks ("outer;inner;leaf" -> samples), the input format of
+    # flamegraph.pl and speedscope. Costs nothing unless started.
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name="cognilearn-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def folded(self):
+        return "\n".join(f"{stack} {n}" for stack, n in self.stacks.most_common())
+
+class Metrics:
+    # Latency histograms per instrumented call plus pluggable collectors for gauges such
+    # as cache hit ratios, rendered in the Prometheus text exposition format.
+    # Profiling is opt-in: with profile_slow_seconds set, every instrumented call is
+    # sampled and the folded stacks of calls slower than the threshold are kept.
+    def __init__(self, prefix="cognilearn", profile_slow_seconds=None, max_profiles=16):
+        self.prefix = prefix
+        self.histograms = {}
+        self.collectors = []
+        self.profile_slow_seconds = profile_slow_seconds
+        self.max_profiles = max_profiles
+        self.profiles = []
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, error=False):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+            if error:
+                histogram.errors += 1
+
+    @contextmanager
+    def timer(self, name):
+        # Read once: profiling may be switched off or on while this call runs
+        slow_seconds = self.profile_slow_seconds
+        profiler = None
+        if slow_seconds is not None:
+            profiler = SamplingProfiler(threading.get_ident()).start()
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            self.observe(name, seconds, error)
+            if profiler is not None:
+                profiler.stop()
+                if seconds >= slow_seconds:
+                    self._keep_profile(name, seconds, profiler)
+
+    def timed(self, name):
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _keep_profile(self, name, seconds, profiler):
+        with self._lock:
+            self.profiles.append({
+                'name': name, 'seconds': seconds, 'time': time.time(), 'folded': profiler.folded()
+            })
+            del self.profiles[:-self.max_profiles]
+
+    def enable_profiling(self, slow_seconds=0.5):
+        self.profile_slow_seconds = slow_seconds
+
+    def disable_profiling(self):
+        self.profile_slow_seconds = None
+
+    def register_collector(self, collect):
+        # collect() -> iterable of (metric name, type, help, labels dict, value)
+        self.collectors.append(collect)
+
+    def render(self):
+        lines = []
+        metric = f"{self.prefix}_call_seconds"
+        with self._lock:
+            histograms = [(name, h, list(h.counts), h.sum, h.count, h.errors) for name, h in sorted(self.histograms.items())]
+        lines.append(f"# HELP {metric} Latency of instrumented calls.")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, h, counts, total, count, _ in histograms:
+            cumulative = 0
+            for bound, n in zip(list(h.buckets) + ["+Inf"], counts):
+                cumulative += n
+                lines.append(f"{metric}_bucket{_labels({'name': name, 'le': bound})} {cumulative}")
+            lines.append(f"{metric}_sum{_labels({'name': name})} {total}")
+            lines.append(f"{metric}_count{_labels({'name': name})} {count}")
+        errors = f"{self.prefix}_call_errors_total"
+        lines.append(f"# HELP {errors} Instrumented calls that raised.")
+        lines.append(f"# TYPE {errors} counter")
+        for name, _, _, _, _, n_errors in histograms:
+            lines.append(f"{errors}{_labels({'name': name})} {n_errors}")
+
+        described = set()
+        for collect in self.collectors:
+            for name, kind, help_text, labels, value in collect():
+                full = f"{self.prefix}_{name}"
+                if full not in described:
+                    lines.append(f"# HELP {full} {help_text}")
+                    lines.append(f"# TYPE {full} {kind}")
+                    described.add(full)
+                lines.append(f"{full}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+# Process-wide instance used by the app, analyzer and recommender. Set
+# COGNILEARN_PROFILE_SLOW_MS to capture flame graph stacks of calls slower than that.
+_slow_ms = os.environ.get("COGNILEARN_PROFILE_SLOW_MS")
+metrics = Metrics(profile_slow_seconds=float(_slow_ms) / 1000 if _slow_ms else None)
+timed = metrics.timed
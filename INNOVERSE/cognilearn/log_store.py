@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+class StudentLogStore:
+    # logs_df sorted by student once, plus an offset index: each student's rows are one
+    # contiguous block, fetched as an iloc slice instead of a boolean scan of every row
+    def __init__(self, logs_df):
+        codes, uniques = pd.factorize(logs_df['student_id'], sort=False)
+        order = np.argsort(codes, kind='stable')
+        self.logs_df = logs_df.take(order).reset_index(drop=True)
+
+        counts = np.bincount(codes, minlength=len(uniques))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.positions = {sid: i for i, sid in enumerate(uniques)}
+
+    def __contains__(self, student_id):
+        return student_id in self.positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def student_ids(self):
+        return list(self.positions)
+
+    def get(self, student_id):
+        # Rows keep their original relative order; unknown students get an empty frame
+        i = self.positions.get(student_id)
+        if i is None:
+            return self.logs_df.iloc[0:0]
+        return self.logs_df.iloc[self.offsets[i]:self.offsets[i + 1]]
+
+    def export_student(self, student_id, path):
+        self.get(student_id).to_csv(path, index=False)
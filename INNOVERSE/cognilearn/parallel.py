@@ -0,0 +1,77 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Columns the per-student sums need, and the dtype each is shipped to workers in
+SHARED_COLUMNS = {
+    'student_id': np.int64,
+    'session': np.int64,
+    'correct': np.float64,
+    'response_time': np.float64,
+    'retried': np.float64
+}
+
+def _partition_of(codes, n_partitions):
+    # Stable hash of the student code, so a student's rows always land together
+    return (pd.util.hash_array(codes.astype(np.int64)) % np.uint64(n_partitions)).astype(np.int64)
+
+def _share(array):
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[:] = array
+    return shm
+
+def _aggregate_partition(analyzer, specs, start, stop):
+    # Runs in a worker: attach to the shared column buffers, view this partition's
+    # contiguous row range (read-only, without copying) and run the analyzer's own
+    # grouped aggregation on it
+    handles = []
+    try:
+        columns = {}
+        for name, (shm_name, dtype, length) in specs.items():
+            shm = shared_memory.SharedMemory(name=shm_name)
+            handles.append(shm)
+            view = np.ndarray((length,), dtype=dtype, buffer=shm.buf)[start:stop]
+            view.flags.writeable = False
+            columns[name] = view
+        frame = pd.DataFrame(columns, copy=False)
+        sums = analyzer.aggregate_logs(frame)
+        # The views must be gone before the buffers can be closed
+        del frame, columns, view
+        return sums
+    finally:
+        for shm in handles:
+            shm.close()
+
+def parallel_aggregate_logs(analyzer, logs_df, workers):
+    # Same result as analyzer.aggregate_logs(logs_df): each student's rows stay together
+    # and in their original order, so every per-student sum is computed identically
+    codes, uniques = pd.factorize(logs_df['student_id'], sort=False)
+    partition = _partition_of(codes, workers)
+    # Counting sort on the small partition ids keeps rows stable within a partition
+    order = np.argsort(partition, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(partition, minlength=workers))])
+
+    shared = {}
+    try:
+        for name, dtype in SHARED_COLUMNS.items():
+            values = codes if name == 'student_id' else logs_df[name].to_numpy(dtype=dtype)
+            shared[name] = _share(np.asarray(values, dtype=dtype)[order])
+        specs = {name: (shm.name, SHARED_COLUMNS[name], len(order)) for name, shm in shared.items()}
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_aggregate_partition, analyzer, specs, bounds[k], bounds[k + 1])
+                for k in range(workers) if bounds[k + 1] > bounds[k]
+            ]
+            parts = [f.result() for f in futures]
+    finally:
+        for shm in shared.values():
+            shm.close()
+            shm.unlink()
+
+    sums = pd.concat(parts)
+    sums.index = pd.Index(uniques[sums.index.to_numpy()], name='student_id')
+    return sums
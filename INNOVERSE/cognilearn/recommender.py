@@ -1,4 +1,17 @@
 import pandas as pd
+import numpy as np
+
+from instrumentation import timed
+
+PRIORITY_THRESHOLDS = [60, 72]
+PRIORITY_LABELS = ["🔴 Critical", "🟡 Moderate", "🟢 On Track"]
+
+def _format_percent(fractions):
+    # Rates are ratios of small counts, so there are far fewer distinct values than
+    # students: format each distinct value once and scatter the strings back
+    values, inverse = np.unique(fractions * 100, return_inverse=True)
+    labels = np.array([f"{v:.1f}%" for v in values.tolist()], dtype=object)
+    return labels[inverse]
 
 class RecommendationEngine:
     def __init__(self):
@@ -59,26 +72,36 @@ class RecommendationEngine:
         else:
             return strats[2]
             
+    @timed("recommender.get_all_recommendations")
     def get_all_recommendations(self, students_df):
-        recs = []
-        for _, student in students_df.iterrows():
-            priority = self.get_priority(student)
-            recs.append({
-                "Student": student['name'],
-                "Pattern": student['pattern'],
-                "Accuracy%": f"{student['accuracy']*100:.1f}%",
-                "Retry Rate%": f"{student['retry_rate']*100:.1f}%",
-                "Priority": priority,
-                "Top Recommendation": self.get_recommendation(student)
-            })
-            
-        df = pd.DataFrame(recs)
-        
+        # Bulk version of get_priority/get_recommendation over the whole frame
+        acc = students_df['accuracy'].to_numpy(dtype=np.float64)
+        retry = students_df['retry_rate'].to_numpy(dtype=np.float64)
+
+        # Priority bands: [0, 60) Critical, [60, 72) Moderate, [72, ...] On Track
+        sort_key = np.searchsorted(PRIORITY_THRESHOLDS, acc * 100, side='right')
+        priority = np.asarray(PRIORITY_LABELS, dtype=object)[sort_key]
+
+        # Strategy slot: 0 foundational for low accuracy, 1 for heavy retriers, else 2
+        slot = np.select([acc < 0.6, retry > 0.5], [0, 1], default=2)
+        patterns = list(self.strategies)
+        table = np.array([self.strategies[p] for p in patterns], dtype=object)
+        codes = pd.Index(patterns).get_indexer(students_df['pattern'])
+        codes[codes < 0] = patterns.index("Mixed Learner")
+
+        df = pd.DataFrame({
+            "Student": students_df['name'].to_numpy(),
+            "Pattern": students_df['pattern'].to_numpy(),
+            "Accuracy%": _format_percent(acc),
+            "Retry Rate%": _format_percent(retry),
+            "Priority": priority,
+            "Top Recommendation": table[codes, slot]
+        })
+
         # Sort by priority: Critical -> Moderate -> On Track
-        priority_map = {"🔴 Critical": 0, "🟡 Moderate": 1, "🟢 On Track": 2}
-        df['sort_key'] = df['Priority'].map(priority_map)
+        df['sort_key'] = sort_key
         df = df.sort_values('sort_key').drop('sort_key', axis=1)
-        
+
         return df
 
 if __name__ == "__main__":
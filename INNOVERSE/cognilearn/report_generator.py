@@ -1,23 +1,33 @@
+import heapq
+
 import pandas as pd
 import numpy as np
 
+# Improvement compares the mean score of the first sessions with the last ones
+FIRST_WINDOW_END = 3
+LAST_WINDOW_START = 18
+AT_RISK_ACCURACY = 0.6
+
 def generate_report_data(students_df, logs_df, metrics_df):
     total_sessions = logs_df['session'].nunique() * logs_df['student_id'].nunique()
-    
+
     # Calculate avg improvement (first 3 vs last 3 sessions)
-    first_3 = logs_df[logs_df['session'] <= 3].groupby('student_id')['score'].mean()
-    last_3 = logs_df[logs_df['session'] >= 18].groupby('student_id')['score'].mean()
-    
+    first_3 = logs_df[logs_df['session'] <= FIRST_WINDOW_END].groupby('student_id')['score'].mean()
+    last_3 = logs_df[logs_df['session'] >= LAST_WINDOW_START].groupby('student_id')['score'].mean()
+
     improvement = (last_3 - first_3).mean()
-    
+
     # At risk count (accuracy < 60)
-    at_risk_count = len(metrics_df[metrics_df['accuracy'] < 0.6])
-    
+    at_risk_count = len(metrics_df[metrics_df['accuracy'] < AT_RISK_ACCURACY])
+
     # Top performer
     top_performer_idx = metrics_df['accuracy'].idxmax()
     top_performer_name = metrics_df.loc[top_performer_idx, 'name']
     top_performer_acc = metrics_df.loc[top_performer_idx, 'accuracy']
-    
+
+    return build_report(total_sessions, improvement, at_risk_count, top_performer_name, top_performer_acc)
+
+def build_report(total_sessions, improvement, at_risk_count, top_performer_name, top_performer_acc):
     # AI generated insights
     insights = [
         f"The top performer is {top_performer_name} with {(top_performer_acc*100):.1f}% overall accuracy.",
@@ -28,7 +38,7 @@ def generate_report_data(students_df, logs_df, metrics_df):
         f"Visual Learners dominate the highest retention percentiles, matching expected pedagogical theories.",
         f"The most challenging subject across all cohorts remains 'Calculus', with a 12% lower baseline accuracy."
     ]
-    
+
     return {
         "summary": {
             "total_sessions": total_sessions,
@@ -39,6 +49,121 @@ def generate_report_data(students_df, logs_df, metrics_df):
         "insights": insights
     }
 
+class ReportAccumulator:
+    # Incremental generate_report_data. Keeps the first- and last-window score sums per
+    # student, the set of sessions seen, an at-risk flag per metrics row and a max-heap of
+    # accuracies, so folding in new logs or changed metrics costs O(changed students).
+    def __init__(self):
+        self.codes = {}
+        self.sessions = set()
+        self.first_sum = np.zeros(0)
+        self.first_count = np.zeros(0, dtype=np.int64)
+        self.last_sum = np.zeros(0)
+        self.last_count = np.zeros(0, dtype=np.int64)
+        # Per-student last minus first window mean, NaN until both windows have scores
+        self.diff = np.zeros(0)
+        self.diff_sum = 0.0
+        self.diff_n = 0
+        # Students whose logs changed since the last update_metrics
+        self.pending = set()
+
+        self.metrics_df = None
+        self.positions = {}
+        self.accuracy = None
+        self.at_risk_count = 0
+        self.heap = []
+
+    def _code(self, student_id):
+        code = self.codes.get(student_id)
+        if code is None:
+            code = self.codes[student_id] = len(self.codes)
+            if code >= len(self.diff):
+                size = max(16, 2 * len(self.diff))
+                for name in ('first_sum', 'first_count', 'last_sum', 'last_count', 'diff'):
+                    old = getattr(self, name)
+                    grown = np.full(size, np.nan) if name == 'diff' else np.zeros(size, dtype=old.dtype)
+                    grown[:len(old)] = old
+                    setattr(self, name, grown)
+        return code
+
+    # ----------------- Logs ----------------- #
+    def add_logs(self, logs_df):
+        if len(logs_df) == 0:
+            return
+        local, uniques = pd.factorize(logs_df['student_id'], sort=False)
+        codes = np.array([self._code(sid) for sid in uniques], dtype=np.int64)[local]
+        session = logs_df['session'].to_numpy()
+        score = logs_df['score'].to_numpy(dtype=np.float64)
+        self.sessions.update(np.unique(session).tolist())
+
+        for mask, sums, counts in (
+            (session <= FIRST_WINDOW_END, self.first_sum, self.first_count),
+            (session >= LAST_WINDOW_START, self.last_sum, self.last_count)
+        ):
+            np.add.at(sums, codes[mask], score[mask])
+            np.add.at(counts, codes[mask], 1)
+
+        touched = np.unique(codes)
+        valid = ~np.isnan(self.diff[touched])
+        self.diff_sum -= self.diff[touched][valid].sum()
+        self.diff_n -= int(valid.sum())
+        with np.errstate(invalid='ignore', divide='ignore'):
+            diff = self.last_sum[touched] / self.last_count[touched] - self.first_sum[touched] / self.first_count[touched]
+        self.diff[touched] = diff
+        valid = ~np.isnan(diff)
+        self.diff_sum += diff[valid].sum()
+        self.diff_n += int(valid.sum())
+        self.pending.update(uniques)
+
+    # ----------------- Metrics ----------------- #
+    def update_metrics(self, metrics_df):
+        # Only the rows of students with new logs are re-read, unless the set of rows changed
+        if metrics_df is self.metrics_df:
+            return
+        previous, self.metrics_df = self.metrics_df, metrics_df
+        if previous is None or len(previous) != len(metrics_df):
+            self._rebuild_metrics()
+        else:
+            rows = np.array([self.positions[sid] for sid in self.pending if sid in self.positions], dtype=np.int64)
+            if len(rows):
+                self._set_accuracy(rows, metrics_df['accuracy'].to_numpy()[rows])
+        self.pending.clear()
+
+    def _rebuild_metrics(self):
+        m = self.metrics_df
+        self.positions = {sid: i for i, sid in enumerate(m['student_id'].tolist())}
+        self.accuracy = m['accuracy'].to_numpy(dtype=np.float64).copy()
+        self.at_risk_count = int((self.accuracy < AT_RISK_ACCURACY).sum())
+        self.heap = [(-acc, i) for i, acc in enumerate(self.accuracy.tolist())]
+        heapq.heapify(self.heap)
+
+    def _set_accuracy(self, rows, accuracy):
+        old = self.accuracy[rows]
+        self.at_risk_count += int((accuracy < AT_RISK_ACCURACY).sum()) - int((old < AT_RISK_ACCURACY).sum())
+        self.accuracy[rows] = accuracy
+        for i, acc in zip(rows.tolist(), accuracy.tolist()):
+            heapq.heappush(self.heap, (-acc, i))
+        # Superseded entries are skipped lazily; compact once they dominate the heap
+        if len(self.heap) > 4 * len(self.accuracy):
+            self.heap = [(-acc, i) for i, acc in enumerate(self.accuracy.tolist())]
+            heapq.heapify(self.heap)
+
+    def top_performer(self):
+        # Highest accuracy, ties going to the earliest row like idxmax
+        while -self.heap[0][0] != self.accuracy[self.heap[0][1]]:
+            heapq.heappop(self.heap)
+        return self.heap[0][1]
+
+    # ----------------- Report ----------------- #
+    def report_data(self):
+        total_sessions = len(self.sessions) * len(self.codes)
+        improvement = self.diff_sum / self.diff_n if self.diff_n else np.nan
+        top = self.top_performer()
+        return build_report(
+            total_sessions, improvement, self.at_risk_count,
+            self.metrics_df['name'].iloc[top], self.accuracy[top]
+        )
+
 if __name__ == "__main__":
     from analyzer import CognitiveAnalyzer
     from data_generator import generate_mock_data
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import ColumnStore, write_store
+
+CACHE_VERSION = 1
+REPORT_FILE = "report.json"
+INDEX_COLUMN = "__index__"
+# Every module on the path from loaded frames to cached results; changing any of them
+# changes every key, so results from older code are never served
+CODE_FILES = (
+    'analyzer.py', 'classifier.py', 'streaming.py', 'recommender.py', 'report_generator.py',
+    'schema.py', 'context.py', 'columnar_store.py', 'result_cache.py'
+)
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def _hash_frame(h, frame):
+    # Column names, dtypes and the raw column buffers; categoricals hash their codes and
+    # categories, so a compact logs_df of millions of rows is hashed without copies
+    h.update(repr((len(frame), list(frame.columns))).encode())
+    for column in frame.columns:
+        series = frame[column]
+        h.update(str(series.dtype).encode())
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            h.update(np.ascontiguousarray(series.cat.codes.to_numpy()))
+            series = pd.Series(series.cat.categories)
+        values = series.to_numpy()
+        if values.dtype == object or not (np.issubdtype(values.dtype, np.number) or values.dtype == bool):
+            values = pd.util.hash_pandas_object(series, index=False).to_numpy()
+        h.update(np.ascontiguousarray(values))
+
+def code_version():
+    h = hashlib.blake2b(digest_size=16)
+    for name in CODE_FILES:
+        with open(os.path.join(HERE, name), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def fingerprint(students_df, logs_df, analyzer):
+    # Key of one pipeline run: the inputs, the analyzer's profiles and settings, and
+    # the code that turns them into metrics, recommendations and the report
+    # sha256 rather than blake2b: hardware accelerated, about 3x faster on column buffers
+    h = hashlib.sha256()
+    h.update(f"{CACHE_VERSION}:{code_version()}".encode())
+    config = {
+        'profiles': {name: np.asarray(p).tolist() for name, p in sorted(analyzer.profiles.items())},
+        'features': analyzer.features,
+        'retention_session': analyzer.retention_session,
+        'distance_metric': analyzer.distance_metric,
+        'feature_weights': None if analyzer.feature_weights is None else np.asarray(analyzer.feature_weights).tolist()
+    }
+    h.update(json.dumps(config, sort_keys=True).encode())
+    _hash_frame(h, students_df)
+    _hash_frame(h, logs_df)
+    return h.hexdigest()
+
+def _json_default(value):
+    # report_data holds numpy scalars
+    return value.item() if isinstance(value, np.generic) else str(value)
+
+class ResultCache:
+    # metrics_df, recs_df and report_data on disk, one directory per fingerprint. Frames
+    # are written as a columnar_store and memory-mapped back, so a hit costs about as
+    # much as opening the store. Entries are written to a temporary directory and
+    # renamed into place, so a reader never sees half an entry; beyond max_entries the
+    # least recently used ones are deleted.
+    def __init__(self, root, max_entries=16):
+        self.root = root
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.root, key)
+
+    def load(self, key):
+        # (metrics_df, recs_df, report_data), or None on a miss
+        path = self.path(key)
+        try:
+            store = ColumnStore(path)
+            with open(os.path.join(path, REPORT_FILE)) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        frames = []
+        for table in ('metrics', 'recs'):
+            frame = store.table(table)
+            # String columns come back dictionary encoded; restore the written dtypes
+            for column, dtype in meta['dtypes'][table].items():
+                if str(frame[column].dtype) != dtype:
+                    frame[column] = frame[column].astype(dtype)
+            if INDEX_COLUMN in frame:
+                frame = frame.set_index(INDEX_COLUMN).rename_axis(None)
+            frames.append(frame)
+        os.utime(path)
+        self.hits += 1
+        return frames[0], frames[1], meta['report_data']
+
+    def store(self, key, metrics_df, recs_df, report_data):
+        path = self.path(key)
+        if os.path.isdir(path):
+            return path
+        tmp = tempfile.mkdtemp(prefix=f".{key}-", dir=self.root)
+        try:
+            # recs_df is sorted by priority; its index is kept as a column
+            tables = {table: frame if frame.index.equals(pd.RangeIndex(len(frame)))
+                      else frame.rename_axis(INDEX_COLUMN).reset_index()
+                      for table, frame in (('metrics', metrics_df), ('recs', recs_df))}
+            write_store(tmp, tables)
+            meta = {
+                'created': time.time(),
+                'dtypes': {table: {c: str(frame[c].dtype) for c in frame.columns} for table, frame in tables.items()},
+                'report_data': report_data
+            }
+            with open(os.path.join(tmp, REPORT_FILE), "w") as f:
+                json.dump(meta, f, default=_json_default)
+            os.replace(tmp, path)
+        except OSError:
+            # Another process stored the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+        self._prune()
+        return path
+
+    def entries(self):
+        return [e for e in os.listdir(self.root) if not e.startswith(".")]
+
+    def _prune(self):
+        entries = sorted(self.entries(), key=lambda e: os.path.getmtime(self.path(e)), reverse=True)
+        for entry in entries[self.max_entries:]:
+            shutil.rmtree(self.path(entry), ignore_errors=True)
+
+    def clear(self):
+        for entry in self.entries():
+            shutil.rmtree(self.path(entry), ignore_errors=True)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the on-disk result cache")
+    parser.add_argument("root")
+    parser.add_argument("--clear", action="store_true")
+    args = parser.parse_args()
+    cache = ResultCache(args.root)
+    if args.clear:
+        cache.clear()
+    for entry in cache.entries():
+        size = sum(os.path.getsize(os.path.join(cache.path(entry), f)) for f in os.listdir(cache.path(entry)))
+        print(f"{entry}  {size / 1024:.1f} KB")
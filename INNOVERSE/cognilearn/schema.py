@@ -0,0 +1,72 @@
+import pandas as pd
+
+# Compact dtype for each column, applied whenever students or logs enter a DataContext.
+# 'integer' means the narrowest integer type that holds the column's values.
+LOG_SCHEMA = {
+    'student_id': 'category',
+    'session': 'integer',
+    'subject': 'category',
+    'response_time': 'float32',
+    'correct': 'bool',
+    'retried': 'bool',
+    'score': 'integer'
+}
+STUDENT_SCHEMA = {
+    'student_id': 'category',
+    'grade': 'integer',
+    'base_archetype': 'category'
+}
+
+def _coerce(series, kind):
+    if kind == 'category':
+        return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    if kind == 'integer':
+        # One-byte columns (e.g. uint8 from a column store) are already as small as it gets
+        if pd.api.types.is_integer_dtype(series) and series.dtype.itemsize == 1:
+            return series
+        return pd.to_numeric(series, downcast='integer')
+    return series.astype(kind)
+
+def apply_schema(frame, schema):
+    columns = {column: _coerce(frame[column], kind) for column, kind in schema.items() if column in frame.columns}
+    return frame.assign(**columns)
+
+def compact_logs(logs_df):
+    return apply_schema(logs_df, LOG_SCHEMA)
+
+def compact_students(students_df):
+    return apply_schema(students_df, STUDENT_SCHEMA)
+
+def compact_data(data):
+    # Loader output (students_df, logs_df) -> the same pair in the compact schema
+    students_df, logs_df = data
+    return compact_students(students_df), compact_logs(logs_df)
+
+def append_logs(logs_df, new_logs):
+    # Concatenates new answer rows without falling back to object columns: the new rows
+    # are compacted and categorical columns are widened to the union of both categories
+    new_logs = compact_logs(new_logs)
+    for column in logs_df.columns:
+        if isinstance(logs_df[column].dtype, pd.CategoricalDtype) and column in new_logs:
+            categories = logs_df[column].cat.categories.union(new_logs[column].cat.categories, sort=False)
+            logs_df = logs_df.assign(**{column: logs_df[column].cat.set_categories(categories)})
+            new_logs = new_logs.assign(**{column: new_logs[column].cat.set_categories(categories)})
+    return pd.concat([logs_df, new_logs], ignore_index=True)
+
+def memory_report(before_df, after_df):
+    # Bytes per column and per row before and after compaction, with a total row
+    before = before_df.memory_usage(deep=True, index=False)
+    after = after_df.memory_usage(deep=True, index=False).reindex(before.index)
+    report = pd.DataFrame({'before_bytes': before, 'after_bytes': after})
+    report.loc['total'] = report.sum()
+    rows = max(len(before_df), 1)
+    report['before_per_row'] = report['before_bytes'] / rows
+    report['after_per_row'] = report['after_bytes'] / rows
+    report['ratio'] = report['before_bytes'] / report['after_bytes']
+    return report
+
+if __name__ == "__main__":
+    from data_generator import generate_mock_data
+
+    _, logs_df = generate_mock_data()
+    print(memory_report(logs_df, compact_logs(logs_df)).round(2).to_string())
@@ -0,0 +1,178 @@
+import os
+import queue
+import time
+
+import numpy as np
+import pandas as pd
+
+from analyzer import LogAccumulator
+from instrumentation import timed
+
+LOG_COLUMNS = ["student_id", "session", "subject", "response_time", "correct", "retried", "score"]
+
+class StreamingAnalyzer:
+    # Keeps metrics_df current as answer events arrive. Each event only touches its
+    # student's running sums; patterns are re-derived for changed rows on the next read.
+    def __init__(self, analyzer, students_df, logs_df=None):
+        self.analyzer = analyzer
+        self.students_df = students_df.reset_index(drop=True)
+        self.accumulator = LogAccumulator(analyzer)
+        self.classifier = analyzer.get_classifier()
+
+        # Register the roster first so codes 0..n-1 follow students_df order; events for
+        # students outside the roster are accumulated but never reported, like analyze_all
+        self.accumulator.student_codes(self.students_df['student_id'])
+        self.n_students = len(self.students_df)
+
+        n_features = len(analyzer.features)
+        self.raw = np.full((self.n_students, n_features), np.nan)
+        self.normalized = np.zeros((self.n_students, n_features))
+        self.pattern_codes = np.zeros(self.n_students, dtype=np.intp)
+        self.data_min = np.full(n_features, np.inf)
+        self.data_max = np.full(n_features, -np.inf)
+
+        self.dirty = set()
+        self.version = 0
+        self._metrics_df = None
+
+        if logs_df is not None:
+            self.ingest_batch(logs_df)
+
+    # ----------------- Ingest ----------------- #
+    def ingest_event(self, event):
+        code = self.accumulator.add(
+            event['student_id'], event['session'], event['correct'],
+            event['response_time'], event['retried']
+        )
+        if code < self.n_students:
+            self.dirty.add(code)
+            self.version += 1
+
+    def ingest_batch(self, logs_df):
+        codes = self.accumulator.ingest(logs_df)
+        codes = codes[codes < self.n_students]
+        if len(codes):
+            self.dirty.update(codes.tolist())
+            self.version += 1
+
+    def drain(self, event_queue, max_events=None):
+        # Pulls whatever is waiting on an in-process queue; returns the events as a logs frame
+        events = []
+        while max_events is None or len(events) < max_events:
+            try:
+                events.append(event_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not events:
+            return pd.DataFrame(columns=LOG_COLUMNS)
+        batch = pd.DataFrame(events, columns=LOG_COLUMNS)
+        if len(batch) == 1:
+            self.ingest_event(events[0])
+        else:
+            self.ingest_batch(batch)
+        return batch
+
+    # ----------------- Refresh ----------------- #
+    def _raw_rows(self, codes):
+        acc = self.accumulator
+        count = acc.count[codes].astype(np.float64)
+        accuracy = acc.correct_sum[codes] / count
+        late = acc.late_count[codes]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            retention = np.where(late > 0, acc.late_correct_sum[codes] / late, 0.5)
+        columns = {
+            'accuracy': accuracy,
+            'avg_response_time': acc.response_time_sum[codes] / count,
+            'retry_rate': acc.retried_sum[codes] / count,
+            'mistake_freq': 1.0 - accuracy,
+            'retention': retention
+        }
+        return np.column_stack([columns[f] for f in self.analyzer.features])
+
+    def _normalize(self, rows):
+        # Mirrors MinMaxScaler.transform so results match a full refit exactly
+        data_range = self.data_max - self.data_min
+        data_range[data_range == 0.0] = 1.0
+        scale = 1.0 / data_range
+        return rows * scale + (0.0 - self.data_min * scale)
+
+    @timed("streaming.refresh")
+    def refresh(self):
+        if not self.dirty:
+            return False
+        codes = np.fromiter(self.dirty, dtype=np.intp)
+        self.dirty.clear()
+
+        old = self.raw[codes]
+        self.raw[codes] = self._raw_rows(codes)
+        new = self.raw[codes]
+
+        # Running extrema only widen on new values; a changed row that used to sit on an
+        # extreme may have let it shrink, which needs one reduction over the active rows
+        held_extreme = np.any((old == self.data_min) | (old == self.data_max))
+        if held_extreme:
+            active = self.raw[self.accumulator.count[:self.n_students] > 0]
+            data_min, data_max = active.min(axis=0), active.max(axis=0)
+        else:
+            data_min = np.minimum(self.data_min, new.min(axis=0))
+            data_max = np.maximum(self.data_max, new.max(axis=0))
+
+        if np.array_equal(data_min, self.data_min) and np.array_equal(data_max, self.data_max):
+            rescale = codes
+        else:
+            # The scale moved, so every normalized row shifts: rescale all of them once
+            self.data_min, self.data_max = data_min, data_max
+            rescale = np.flatnonzero(self.accumulator.count[:self.n_students] > 0)
+
+        self.normalized[rescale] = self._normalize(self.raw[rescale])
+        dist = self.classifier.distances(self.normalized[rescale])
+        self.pattern_codes[rescale] = dist.argmin(axis=1)
+        self._metrics_df = None
+        return True
+
+    def metrics_df(self):
+        self.refresh()
+        if self._metrics_df is None:
+            self._metrics_df = self._build_metrics_df()
+        return self._metrics_df
+
+    def _build_metrics_df(self):
+        acc = self.accumulator
+        n = self.n_students
+        active = np.flatnonzero(acc.count[:n] > 0)
+        features = self.analyzer.features
+
+        metrics_df = self.students_df.loc[active, ['student_id', 'name', 'grade']].reset_index(drop=True)
+        raw = {f: self.raw[active, i] for i, f in enumerate(features)}
+        raw['sessions_completed'] = acc.seen_sessions[active].sum(axis=1).astype(np.int64)
+        for col in ['accuracy', 'avg_response_time', 'retry_rate', 'mistake_freq', 'sessions_completed', 'retention']:
+            metrics_df[col] = raw[col]
+        metrics_df['pattern'] = self.classifier.labels[self.pattern_codes[active]]
+        for i, f in enumerate(features):
+            metrics_df[f"{f}_norm"] = self.normalized[active, i]
+        return metrics_df
+
+def tail_csv(path, event_queue, stop_event, poll_interval=0.5):
+    # Follows a growing CSV of answer events (header + one row per event) and pushes
+    # each new row onto event_queue until stop_event is set
+    while not os.path.exists(path) and not stop_event.is_set():
+        time.sleep(poll_interval)
+    with open(path, 'rb') as f:
+        header = f.readline().decode().strip().split(',')
+        while not stop_event.is_set():
+            line = f.readline()
+            if not line.endswith(b'\n'):
+                # Nothing new, or a partial line: rewind and wait for the writer to finish it
+                f.seek(-len(line), os.SEEK_CUR)
+                time.sleep(poll_interval)
+                continue
+            values = dict(zip(header, line.decode().strip().split(',')))
+            event_queue.put({
+                'student_id': values['student_id'],
+                'session': int(values['session']),
+                'subject': values['subject'],
+                'response_time': float(values['response_time']),
+                'correct': int(values['correct']),
+                'retried': int(values['retried']),
+                'score': int(values['score'])
+            })
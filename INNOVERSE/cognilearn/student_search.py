@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+class StudentSearchIndex:
+    # Server-side search for the student dropdown. Every word of name, student_id and
+    # pattern is a token in one sorted array, so a prefix lookup is two searchsorted
+    # calls; substring matches over the full label are only scanned when prefixes find
+    # fewer than limit students. Results are capped at limit, so the option payload
+    # stays the same size however large the cohort is.
+    def __init__(self, metrics_df, limit=20, max_cached_queries=256):
+        self.limit = limit
+        self.ids = metrics_df['student_id'].astype(str).to_numpy(dtype=object)
+        names = metrics_df['name'].astype(str)
+        patterns = metrics_df['pattern'].astype(str)
+        self.labels = (names + " (" + patterns + ")").to_numpy(dtype=object)
+        self.search_text = (names + " " + pd.Series(self.ids, index=names.index) + " " + patterns).str.lower()
+
+        tokens = self.search_text.str.split().explode()
+        order = np.argsort(tokens.to_numpy(dtype=str), kind='stable')
+        self.tokens = tokens.to_numpy(dtype=str)[order]
+        self.token_rows = np.arange(len(metrics_df)).repeat(self.search_text.str.split().str.len())[order]
+        self.max_cached_queries = max_cached_queries
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _prefix_rows(self, word):
+        lo = np.searchsorted(self.tokens, word, side='left')
+        hi = np.searchsorted(self.tokens, word + '\U0010ffff', side='left')
+        return np.unique(self.token_rows[lo:hi])
+
+    def search(self, query):
+        # Row positions of the best matches: students with a token starting with every
+        # query word first, then students whose label contains the query, in cohort order
+        key = (query or "").strip().lower()
+        rows = self._cache.get(key)
+        if rows is not None:
+            self._cache.move_to_end(key)
+            return rows
+        if not key:
+            rows = np.arange(min(self.limit, len(self.ids)))
+        else:
+            words = key.split()
+            rows = self._prefix_rows(words[0])
+            for word in words[1:]:
+                rows = np.intersect1d(rows, self._prefix_rows(word), assume_unique=True)
+            rows = rows[:self.limit]
+            if len(rows) < self.limit:
+                contains = np.flatnonzero(self.search_text.str.contains(key, regex=False).to_numpy())
+                extra = contains[~np.isin(contains, rows)]
+                rows = np.concatenate([rows, extra[:self.limit - len(rows)]])
+        self._cache[key] = rows
+        if len(self._cache) > self.max_cached_queries:
+            self._cache.popitem(last=False)
+        return rows
+
+    def options(self, query="", selected=None):
+        # Dropdown options for a query; the selected student is always kept so the
+        # dropdown can still display it
+        rows = self.search(query)
+        options = [{'label': self.labels[i], 'value': self.ids[i]} for i in rows.tolist()]
+        if selected is not None and all(o['value'] != selected for o in options):
+            hit = np.flatnonzero(self.ids == selected)
+            if len(hit):
+                options.insert(0, {'label': self.labels[hit[0]], 'value': selected})
+        return options
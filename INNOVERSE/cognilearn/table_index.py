@@ -0,0 +1,160 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Dash filter_query operators; symbols are checked longest first so "<=" wins over "<"
+SYMBOL_OPERATORS = ['>=', '<=', '!=', '<', '>', '=']
+WORD_OPERATORS = {
+    'eq': '=', 'ne': '!=', 'lt': '<', 'le': '<=', 'gt': '>', 'ge': '>=',
+    'contains': 'contains', 'datestartswith': 'startswith'
+}
+
+def split_filter_part(filter_part):
+    # "{Pattern} icontains visual" -> ("Pattern", "contains", "visual", True); the last
+    # item tells whether the comparison ignores case
+    part = filter_part.strip()
+    if not part.startswith('{') or '}' not in part:
+        return None, None, None, False
+    column = part[1:part.index('}')]
+    rest = part[part.index('}') + 1:].strip()
+    # Dash prefixes operators with s (case-sensitive) or i (case-insensitive)
+    ignore_case = False
+    if rest[:1] in ('s', 'i') and (rest[1:2] in '<>!=' or rest[1:].split(' ', 1)[0] in WORD_OPERATORS):
+        ignore_case = rest[0] == 'i'
+        rest = rest[1:]
+
+    op = next((sym for sym in SYMBOL_OPERATORS if rest.startswith(sym)), None)
+    if op is not None:
+        value = rest[len(op):].strip()
+    else:
+        word, _, value = rest.partition(' ')
+        op = WORD_OPERATORS.get(word)
+        if op is None:
+            return None, None, None, False
+        value = value.strip()
+
+    if value and value[0] == value[-1] and value[0] in ("'", '"', '`') and len(value) > 1:
+        value = value[1:-1].replace('\\' + value[0], value[0])
+    else:
+        try:
+            value = float(value)
+        except ValueError:
+            pass
+    return column, op, value, ignore_case
+
+class PriorityTableIndex:
+    # Server-side view of the intervention table. Sort orders are computed once per
+    # sort spec and filter masks once per query, so each page request is a slice plus
+    # a to_dict over page_size rows.
+    def __init__(self, recs_df, metrics_df, max_cached_views=32):
+        self.recs_df = recs_df.reset_index(drop=True)
+        metric_rows = metrics_df.iloc[recs_df.index]
+        # Percent columns sort and filter on their numeric value, not the "55.0%" string
+        self.keys = {
+            'Student': self._codes(self.recs_df['Student']),
+            'Pattern': self._codes(self.recs_df['Pattern']),
+            'Priority': np.searchsorted(
+                ["🔴 Critical", "🟡 Moderate"], self.recs_df['Priority'].to_numpy(dtype=object), side='right'
+            ),
+            'Accuracy%': metric_rows['accuracy'].to_numpy(dtype=np.float64) * 100,
+            'Retry Rate%': metric_rows['retry_rate'].to_numpy(dtype=np.float64) * 100,
+            'Top Recommendation': self._codes(self.recs_df['Top Recommendation'])
+        }
+        self.numeric = {'Accuracy%', 'Retry Rate%'}
+        # Equality filters on the low-cardinality columns hit precomputed position lists
+        self.groups = {
+            col: {k: np.asarray(v) for k, v in self.recs_df.groupby(col, sort=False).indices.items()}
+            for col in ('Priority', 'Pattern')
+        }
+        self.max_cached_views = max_cached_views
+        self._orders = {}
+        self._views = {}
+        self._lock = threading.Lock()
+        for col in ('Priority', 'Accuracy%', 'Pattern'):
+            for direction in ('asc', 'desc'):
+                self.sort_order([{'column_id': col, 'direction': direction}])
+
+    @staticmethod
+    def _codes(series):
+        codes, _ = pd.factorize(series, sort=True)
+        return codes
+
+    def __len__(self):
+        return len(self.recs_df)
+
+    def sort_order(self, sort_by):
+        # Row positions for a DataTable sort_by list; the base order is the priority order
+        spec = tuple((s['column_id'], s['direction']) for s in (sort_by or []) if s['column_id'] in self.keys)
+        if spec not in self._orders:
+            if not spec:
+                order = np.arange(len(self.recs_df))
+            else:
+                # lexsort sorts by the last key first; negating a key flips its direction
+                keys = [self.keys[col] if direction == 'asc' else -self.keys[col] for col, direction in reversed(spec)]
+                order = np.lexsort(keys)
+            self._orders[spec] = order
+        return self._orders[spec]
+
+    def filter_mask(self, filter_query):
+        mask = np.ones(len(self.recs_df), dtype=bool)
+        for part in (filter_query or '').split(' && '):
+            column, op, value, ignore_case = split_filter_part(part)
+            if column is None or column not in self.recs_df.columns:
+                continue
+            if op == '=' and column in self.groups and not isinstance(value, float) and not ignore_case:
+                hit = np.zeros(len(self.recs_df), dtype=bool)
+                hit[self.groups[column].get(value, [])] = True
+                mask &= hit
+                continue
+
+            # Percent columns compare numerically; text operators match the displayed
+            # "55.0%" string, as they do for every other column
+            if column in self.numeric and isinstance(value, float) and op not in ('contains', 'startswith'):
+                values = self.keys[column]
+            else:
+                values = self.recs_df[column].astype(str)
+                value = str(value) if not isinstance(value, float) else f"{value:g}"
+                if ignore_case:
+                    values, value = values.str.lower(), value.lower()
+
+            if op == 'contains':
+                mask &= np.asarray(pd.Series(values).str.contains(value, regex=False))
+            elif op == 'startswith':
+                mask &= np.asarray(pd.Series(values).str.startswith(value))
+            elif op == '=':
+                mask &= np.asarray(values == value)
+            elif op == '!=':
+                mask &= np.asarray(values != value)
+            elif op == '<':
+                mask &= np.asarray(values < value)
+            elif op == '<=':
+                mask &= np.asarray(values <= value)
+            elif op == '>':
+                mask &= np.asarray(values > value)
+            elif op == '>=':
+                mask &= np.asarray(values >= value)
+        return mask
+
+    def view(self, sort_by=None, filter_query=''):
+        # Positions of the filtered rows in display order, cached per (sort, filter)
+        key = (tuple((s['column_id'], s['direction']) for s in (sort_by or [])), filter_query or '')
+        with self._lock:
+            positions = self._views.get(key)
+        if positions is None:
+            # Computed outside the lock so a slow filter does not block other callbacks
+            order = self.sort_order(sort_by)
+            positions = order[self.filter_mask(filter_query)[order]] if filter_query else order
+            with self._lock:
+                if key not in self._views and len(self._views) >= self.max_cached_views:
+                    self._views.pop(next(iter(self._views)))
+                self._views[key] = positions
+        return positions
+
+    def page(self, page_current=0, page_size=10, sort_by=None, filter_query=''):
+        # Returns (records for the page, page_count)
+        positions = self.view(sort_by, filter_query)
+        page_count = max(1, -(-len(positions) // page_size))
+        start = (page_current or 0) * page_size
+        rows = self.recs_df.iloc[positions[start:start + page_size]]
+        return rows.to_dict('records'), page_count
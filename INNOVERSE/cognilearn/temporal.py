@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+TEMPORAL_COLUMNS = ['recent_accuracy', 'peak_accuracy', 'forgetting_drop', 'forgetting',
+                    'learning_slope', 'response_time_decay']
+
+# Every feature is computed for all students at once from per-(student, session) totals
+# held as dense students x sessions arrays, one column per distinct session in the logs
+# (not per session number, so a stray large session cannot blow up the width): one
+# bincount over a flat cell index builds them, rolling windows are strided views over
+# the session axis, and the least-squares fits reduce to a few weighted sums along
+# that axis. The drill-down learning curve reads the same grid, so its windows are the
+# ones the features were computed over.
+
+def session_grid(logs_df):
+    codes, students = pd.factorize(logs_df['student_id'], sort=False)
+    columns, sessions = pd.factorize(logs_df['session'].to_numpy(dtype=np.int64), sort=True)
+    cell = codes * len(sessions) + columns
+    shape = (len(students), len(sessions))
+
+    def total(weights=None):
+        return np.bincount(cell, weights, minlength=shape[0] * shape[1]).reshape(shape).astype(np.float64)
+
+    response_time = logs_df['response_time'].to_numpy(dtype=np.float64)
+    return {
+        'students': students,
+        'sessions': sessions.astype(np.float64),
+        'count': total(),
+        'correct': total(logs_df['correct'].to_numpy(dtype=np.float64)),
+        'log_response_time': total(np.log(np.clip(response_time, 1e-3, None)))
+    }
+
+def rolling_accuracy(grid, window=3):
+    # Accuracy over every run of window consecutive sessions of the grid, one column per
+    # run ending at its window-th..last session; NaN where the student has no answers in
+    # the run
+    window = max(1, min(window, grid['count'].shape[1]))
+    counts = sliding_window_view(grid['count'], window, axis=1).sum(axis=2)
+    correct = sliding_window_view(grid['correct'], window, axis=1).sum(axis=2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return correct / counts
+
+def _slopes(grid, y):
+    # Least-squares slope of y (per-answer values, summed per cell) over session, with
+    # every answer weighted equally; 0 for students seen in a single session. Sessions
+    # are centered first, which leaves the slope unchanged but keeps the sums small.
+    x = grid['sessions']
+    x = x - x.mean() if len(x) else x
+    n = grid['count'].sum(axis=1)
+    sx = grid['count'] @ x
+    sxx = grid['count'] @ (x * x)
+    sy = y.sum(axis=1)
+    sxy = y @ x
+    denominator = n * sxx - sx * sx
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = (n * sxy - sx * sy) / denominator
+    return np.where(denominator > 0, slope, 0.0)
+
+def temporal_features(logs_df, window=3, forgetting_drop=0.15, grid=None):
+    # One row per student with answers, in first-seen order:
+    #   recent_accuracy      accuracy over the student's latest window of sessions
+    #   peak_accuracy        best accuracy over any window
+    #   forgetting_drop      peak minus recent; forgetting when at least forgetting_drop
+    #   learning_slope       change in accuracy per session (least-squares fit)
+    #   response_time_decay  fraction by which response times shrink per session, from a
+    #                        fit of log(response_time); negative when the student slows
+    grid = session_grid(logs_df) if grid is None else grid
+    rolling = rolling_accuracy(grid, window)
+    seen = ~np.isnan(rolling)
+    latest = rolling.shape[1] - 1 - np.argmax(seen[:, ::-1], axis=1)
+    recent = rolling[np.arange(len(rolling)), latest]
+    peak = np.nanmax(np.where(seen, rolling, -np.inf), axis=1)
+    drop = peak - recent
+
+    features = pd.DataFrame({
+        'student_id': grid['students'],
+        'recent_accuracy': recent,
+        'peak_accuracy': peak,
+        'forgetting_drop': drop,
+        'forgetting': drop >= forgetting_drop,
+        'learning_slope': _slopes(grid, grid['correct']),
+        'response_time_decay': -_slopes(grid, grid['log_response_time'])
+    })
+    return features
+
+def learning_curve(grid, student_id, window=3):
+    # Per-session accuracy of one student of the grid with the rolling accuracy ending at
+    # each session and the least-squares trend line, for the drill-down chart
+    if student_id not in grid['students']:
+        return pd.DataFrame(columns=['session', 'accuracy', 'rolling_accuracy', 'trend'])
+    row = grid['students'].get_loc(student_id)
+    grid = {**grid, 'students': grid['students'][row:row + 1],
+            **{key: grid[key][row:row + 1] for key in ('count', 'correct', 'log_response_time')}}
+    count, correct = grid['count'][0], grid['correct'][0]
+    rolling = rolling_accuracy(grid, window)[0]
+    sessions = grid['sessions']
+    slope = _slopes(grid, grid['correct'])[0]
+    mean_session = (count @ sessions) / count.sum()
+    rolling = np.concatenate([np.full(len(sessions) - len(rolling), np.nan), rolling])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        curve = pd.DataFrame({
+            'session': sessions.astype(np.int64),
+            'accuracy': correct / count,
+            'rolling_accuracy': rolling,
+            'trend': correct.sum() / count.sum() + slope * (sessions - mean_session)
+        })
+    # Sessions the student skipped have no accuracy but keep the rolling value while a
+    # window still covers their answers; the last one is the features' recent_accuracy
+    return curve[(count > 0) | ~np.isnan(rolling)].reset_index(drop=True)
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from aggregates import AggregateCache
+from analyzer import CognitiveAnalyzer
+from data_generator import generate_mock_data
+
+
+def _cache():
+    students_df, logs_df = generate_mock_data()
+    metrics_df = CognitiveAnalyzer().analyze_all(students_df, logs_df)
+    return logs_df, metrics_df, AggregateCache(logs_df, metrics_df)
+
+
+def test_cohort_aggregates_match_direct_groupbys():
+    logs_df, metrics_df, cache = _cache()
+
+    pd.testing.assert_frame_equal(cache.session_trend, logs_df.groupby('session')['score'].mean().reset_index())
+    expected = logs_df.merge(metrics_df[['student_id', 'pattern']], on='student_id').groupby(['pattern', 'session'])['score'].mean().reset_index()
+    pd.testing.assert_frame_equal(cache.pattern_trajectory, expected)
+    assert cache.funnel_counts['proficient'] == len(metrics_df[metrics_df['accuracy'] > 0.75])
+    assert cache.pattern_counts['count'].sum() == len(metrics_df)
+
+
+def test_student_aggregates_match_per_student_scans():
+    logs_df, _, cache = _cache()
+    s_logs = logs_df[logs_df['student_id'] == 'STU007']
+
+    expected_trend = s_logs.groupby('session').agg({'score': 'mean', 'response_time': 'mean'}).reset_index()
+    pd.testing.assert_frame_equal(cache.student_trend('STU007'), expected_trend)
+
+    expected_mistakes = s_logs[s_logs['correct'] == 0].groupby('subject').size().reset_index(name='count')
+    pd.testing.assert_frame_equal(cache.student_mistakes('STU007'), expected_mistakes)
+
+    assert len(cache.student_trend('NOPE')) == 0
+    assert len(cache.student_mistakes('NOPE')) == 0
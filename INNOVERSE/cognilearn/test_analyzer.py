@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+from analyzer import CognitiveAnalyzer, LogAccumulator
+from data_generator import generate_bulk_data, generate_mock_data, iter_mock_data
+
+
+def estimate_retention(analyzer, student_logs):
+    # late-session accuracy (e.g. sessions 15-20)
+    late_sessions = student_logs[student_logs['session'] >= analyzer.retention_session]
+    if len(late_sessions) == 0:
+        return 0.5
+    return late_sessions['correct'].mean()
+
+
+def analyze_all_iterative(analyzer, students_df, logs_df):
+    # Reference per-student loop that analyze_all must match
+    metrics = []
+
+    for idx, student in students_df.iterrows():
+        sid = student['student_id']
+        s_logs = logs_df[logs_df['student_id'] == sid]
+
+        if len(s_logs) == 0:
+            continue
+
+        accuracy = s_logs['correct'].mean()
+        avg_response_time = s_logs['response_time'].mean()
+        retry_rate = s_logs['retried'].mean()
+        mistake_freq = 1.0 - accuracy  # complementary to accuracy
+        sessions_completed = s_logs['session'].nunique()
+        retention_score = estimate_retention(analyzer, s_logs)
+
+        metrics.append({
+            'student_id': sid,
+            'name': student['name'],
+            'grade': student['grade'],
+            'accuracy': accuracy,
+            'avg_response_time': avg_response_time,
+            'retry_rate': retry_rate,
+            'mistake_freq': mistake_freq,
+            'sessions_completed': sessions_completed,
+            'retention': retention_score
+        })
+
+    metrics_df = pd.DataFrame(metrics)
+
+    # Normalize metrics for classification using Euclidean distance
+    features = ['accuracy', 'avg_response_time', 'retry_rate', 'mistake_freq', 'retention']
+    scaler = MinMaxScaler()
+    normalized_data = scaler.fit_transform(metrics_df[features])
+
+    # Classification
+    patterns = []
+    for row in normalized_data:
+        distances = {
+            pattern: np.linalg.norm(row - profile)
+            for pattern, profile in analyzer.profiles.items()
+        }
+        best_pattern = min(distances, key=distances.get)
+        patterns.append(best_pattern)
+
+    metrics_df['pattern'] = patterns
+
+    # We also want to keep the normalized data around if helpful,
+    # but let's just return metrics_df with everything.
+    # Add the normalized columns for easy radar plotting
+    for i, f in enumerate(features):
+        metrics_df[f"{f}_norm"] = normalized_data[:, i]
+
+    return metrics_df
+
+
+def test_analyze_all_matches_iterative_loop():
+    students_df, logs_df = generate_mock_data()
+    analyzer = CognitiveAnalyzer()
+
+    expected = analyze_all_iterative(analyzer, students_df, logs_df)
+    result = analyzer.analyze_all(students_df, logs_df)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_analyze_all_skips_students_without_logs():
+    students_df, logs_df = generate_mock_data()
+    logs_df = logs_df[logs_df['student_id'] != 'STU002']
+    analyzer = CognitiveAnalyzer()
+
+    expected = analyze_all_iterative(analyzer, students_df, logs_df)
+    result = analyzer.analyze_all(students_df, logs_df)
+
+    assert 'STU002' not in set(result['student_id'])
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_retention_defaults_when_no_late_sessions():
+    students_df, logs_df = generate_mock_data()
+    logs_df = logs_df[~((logs_df['student_id'] == 'STU003') & (logs_df['session'] >= 15))]
+    analyzer = CognitiveAnalyzer()
+
+    result = analyzer.analyze_all(students_df, logs_df)
+
+    assert result.loc[result['student_id'] == 'STU003', 'retention'].iloc[0] == 0.5
+
+
+def test_analyze_chunks_matches_analyze_all():
+    students_df, logs_df = generate_mock_data()
+    analyzer = CognitiveAnalyzer()
+
+    # Shuffle so each student's rows are spread across many chunks
+    shuffled = logs_df.sample(frac=1.0, random_state=0)
+    chunks = (shuffled.iloc[i:i + 997] for i in range(0, len(shuffled), 997))
+    result = analyzer.analyze_chunks(students_df, chunks)
+
+    pd.testing.assert_frame_equal(result, analyzer.analyze_all(students_df, logs_df))
+
+
+def test_accumulator_width_follows_distinct_sessions():
+    students_df, logs_df = generate_mock_data()
+    logs_df.loc[0, 'session'] = 20250115
+    analyzer = CognitiveAnalyzer()
+
+    accumulator = LogAccumulator(analyzer)
+    accumulator.ingest(logs_df.iloc[:500])
+    accumulator.ingest(logs_df.iloc[500:])
+    assert accumulator.seen_sessions.shape[1] == logs_df['session'].nunique()
+    pd.testing.assert_frame_equal(accumulator.finalize(students_df), analyzer.analyze_all(students_df, logs_df))
+
+
+def test_analyze_chunks_from_streamed_bulk_data():
+    students_df, logs_df = generate_bulk_data(n_students=300, n_sessions=20, seed=2, block_size=64)
+    analyzer = CognitiveAnalyzer()
+
+    chunks = (logs for _, logs in iter_mock_data(n_students=300, n_sessions=20, seed=2, block_size=64))
+    result = analyzer.analyze_chunks(students_df, chunks)
+    expected = analyzer.analyze_all(students_df, logs_df)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_parallel_analysis_matches_serial_exactly():
+    students_df, logs_df = generate_bulk_data(n_students=400, n_sessions=20, seed=9)
+    analyzer = CognitiveAnalyzer()
+
+    serial = analyzer.analyze_all(students_df, logs_df)
+    for workers in (2, 3):
+        parallel = analyzer.analyze_all(students_df, logs_df, workers=workers)
+        pd.testing.assert_frame_equal(parallel, serial, check_exact=True)
@@ -0,0 +1,31 @@
+import json
+
+from benchmarks import compare_results, run_benchmarks
+
+EXPECTED = {
+    'generate_mock_data', 'analyze_all', 'get_all_recommendations', 'generate_report_data',
+    'render_tab_1', 'render_tab_2', 'render_tab_3', 'render_tab_4', 'render_tab_5',
+    'update_student_profile'
+}
+
+
+def test_run_benchmarks_covers_every_stage_and_callback():
+    report = run_benchmarks({'tiny': 20}, memory=False)
+    results = report['results']['tiny']
+
+    assert EXPECTED <= set(results)
+    assert all(results[name]['seconds'] > 0 for name in EXPECTED)
+    assert results['_cohort']['students'] == 20
+    json.dumps(report)
+
+
+def test_compare_flags_only_large_regressions(tmp_path):
+    baseline = {'results': {'5k': {'analyze_all': {'seconds': 1.0, 'peak_mb': 100.0},
+                                   'render_tab_4': {'seconds': 0.001}}}}
+    current = {'results': {'5k': {'analyze_all': {'seconds': 2.0, 'peak_mb': 110.0},
+                                  'render_tab_4': {'seconds': 0.004}}}}
+
+    regressions = compare_results(current, baseline, threshold=0.5)
+    # render_tab_4 quadrupled but by 3ms, under the absolute floor
+    assert [(r['benchmark'], r['metric']) for r in regressions] == [('analyze_all', 'seconds')]
+    assert compare_results(baseline, baseline) == []
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from binning import bin_2d, box_stats, histogram
+from data_generator import generate_mock_data
+
+
+def test_histogram_and_box_stats_match_numpy():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({'group': rng.choice(['a', 'b'], 1000), 'value': rng.normal(size=1000)})
+    frame.loc[0, 'value'] = 50.0  # an outlier for group of row 0
+
+    centers, widths, counts = histogram(frame['value'], bins=10)
+    assert counts.sum() == 1000 and len(centers) == len(widths) == 10
+
+    stats = box_stats(frame, 'group', 'value').set_index('group')
+    values = frame.loc[frame['group'] == frame.loc[0, 'group'], 'value']
+    row = stats.loc[frame.loc[0, 'group']]
+    assert row['median'] == np.median(values)
+    assert row['q3'] == np.percentile(values, 75)
+    assert row['upperfence'] < 50.0 and row['outliers'] >= 1
+    assert stats['count'].sum() == 1000
+
+
+def test_bin_2d_conserves_students_on_a_bounded_grid():
+    rng = np.random.default_rng(1)
+    frame = pd.DataFrame({'g': rng.choice(['a', 'b', 'c'], 20000), 'x': rng.random(20000), 'y': rng.random(20000)})
+    cells = bin_2d(frame, 'x', 'y', 'g', bins=20)
+
+    assert cells['count'].sum() == 20000
+    assert len(cells) <= 3 * 20 * 20
+    assert cells['x'].between(0, 1).all() and cells['y'].between(0, 1).all()
+
+
+def test_large_cohort_figures_have_bounded_payloads(monkeypatch):
+    import app
+    monkeypatch.setattr(app, "SVG_POINT_LIMIT", 100)
+    monkeypatch.setattr(app, "WEBGL_POINT_LIMIT", 500)
+
+    sizes = []
+    for n in (1000, 3000):
+        app.registry.register(f"large-{n}", lambda n=n: generate_mock_data(n_students=n, bulk=True, seed=n))
+        try:
+            app.select_cohort(f"large-{n}")
+            figures = [app.build_accuracy_hist(), app.build_rt_accuracy_scatter(), app.build_accuracy_box()]
+            assert figures[1].data[0].type == 'scattergl'
+            sizes.append(sum(len(f.to_json()) for f in figures))
+        finally:
+            app.registry.unregister(f"large-{n}")
+            app.select_cohort(app.DEFAULT_COHORT)
+    # Three times the students, about the same payload
+    assert sizes[1] < sizes[0] * 1.5
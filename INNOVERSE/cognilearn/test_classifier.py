@@ -0,0 +1,45 @@
+import numpy as np
+
+from analyzer import CognitiveAnalyzer
+from classifier import NearestProfileClassifier
+
+
+def _reference_labels(X, profiles):
+    labels = []
+    for row in X:
+        distances = {pattern: np.linalg.norm(row - profile) for pattern, profile in profiles.items()}
+        labels.append(min(distances, key=distances.get))
+    return labels
+
+
+def test_euclidean_matches_per_row_norm():
+    profiles = CognitiveAnalyzer().profiles
+    X = np.random.default_rng(0).random((2000, 5))
+    labels, dist, conf = NearestProfileClassifier(profiles, chunk_size=128).classify(X)
+
+    assert list(labels) == _reference_labels(X, profiles)
+    assert dist.shape == (2000, len(profiles))
+    np.testing.assert_allclose(conf.sum(axis=1), 1.0)
+
+
+def test_chunking_does_not_change_results():
+    profiles = CognitiveAnalyzer().profiles
+    X = np.random.default_rng(1).random((1000, 5))
+    small = NearestProfileClassifier(profiles, chunk_size=7).classify(X)
+    large = NearestProfileClassifier(profiles, chunk_size=100000).classify(X)
+
+    assert list(small[0]) == list(large[0])
+    np.testing.assert_array_equal(small[1], large[1])
+
+
+def test_weighted_and_cosine_metrics():
+    profiles = {"a": np.array([1.0, 0.0]), "b": np.array([0.0, 1.0])}
+    X = np.array([[0.9, 0.1], [0.2, 2.0], [0.0, 0.0]])
+
+    labels, dist, _ = NearestProfileClassifier(profiles, metric="cosine").classify(X)
+    assert list(labels) == ["a", "b", "a"]
+    np.testing.assert_allclose(dist[2], [1.0, 1.0])
+
+    # With the second feature ignored only the first coordinate decides
+    labels, _, _ = NearestProfileClassifier(profiles, metric="weighted_euclidean", weights=[1.0, 0.0]).classify(X)
+    assert list(labels) == ["a", "b", "b"]
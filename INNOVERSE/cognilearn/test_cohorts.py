@@ -0,0 +1,63 @@
+import pandas as pd
+
+from cohorts import CohortRegistry
+from data_generator import generate_mock_data, write_mock_data
+
+
+def test_cohorts_have_independent_contexts():
+    registry = CohortRegistry()
+    registry.register("north", lambda: generate_mock_data(n_students=30, bulk=True, seed=1))
+    registry.register("south", lambda: generate_mock_data(n_students=40, bulk=True, seed=2))
+
+    north, south = registry.get("north"), registry.get("south")
+    assert north is not south
+    assert north.figure_cache is not south.figure_cache
+    assert len(north.metrics_df) == 30
+    assert len(south.metrics_df) == 40
+    assert registry.get("north") is north
+
+
+def test_least_recently_used_cohorts_are_evicted_over_budget():
+    registry = CohortRegistry(memory_budget_bytes=1)
+    for seed in range(3):
+        registry.register(f"school-{seed}", lambda seed=seed: generate_mock_data(n_students=20, bulk=True, seed=seed))
+
+    first = registry.get("school-0")
+    first.metrics_df
+    registry.get("school-1").metrics_df
+    # The requested cohort always stays; everything else goes once the budget is blown
+    assert registry.resident() == ["school-1"]
+    registry.get("school-2")
+    assert registry.resident() == ["school-2"]
+    assert registry.evictions == 2
+
+    rebuilt = registry.get("school-0")
+    assert rebuilt is not first
+    pd.testing.assert_frame_equal(rebuilt.metrics_df, first.metrics_df)
+
+
+def test_register_directory_reads_written_cohorts(tmp_path):
+    write_mock_data(tmp_path / "east", fmt="csv", n_students=25, n_sessions=20, seed=3, block_size=10)
+    registry = CohortRegistry()
+    registry.register_directory(tmp_path)
+
+    assert registry.names() == ["east"]
+    assert len(registry.get("east").metrics_df) == 25
+
+
+def test_learning_funnel_counts_follow_the_cohort():
+    import app
+    students_df, logs_df = generate_mock_data(n_students=120, bulk=True, seed=8)
+    logs_df = logs_df[logs_df['student_id'] != students_df['student_id'].iloc[0]]
+    app.registry.register("funnel", lambda: (students_df, logs_df))
+    try:
+        app.select_cohort("funnel")
+        ctx = app.current_context()
+        counts = list(app.build_learning_funnel().data[0].x)
+    finally:
+        app.registry.unregister("funnel")
+        app.select_cohort(app.DEFAULT_COHORT)
+
+    at_risk = ctx.report_data['summary']['at_risk_count']
+    assert counts[:3] == [120, 119, 119 - at_risk]
+    assert all(c >= 0 for c in counts)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from analyzer import CognitiveAnalyzer
+from cohorts import CohortRegistry
+from columnar_store import ColumnStore, build_store, write_store
+from data_generator import generate_mock_data
+
+
+def as_plain(frame):
+    # Dictionary columns come back as categoricals; compare on their values
+    return frame.astype({c: str for c in frame.columns if isinstance(frame[c].dtype, pd.CategoricalDtype)})
+
+
+def test_store_round_trips_logs_with_compact_encodings(tmp_path):
+    students_df, logs_df = generate_mock_data(n_students=120, bulk=True, seed=4)
+    write_store(tmp_path, {'students': students_df, 'logs': logs_df})
+    store = ColumnStore(tmp_path)
+    _, stored = store.data()
+
+    assert stored['session'].dtype == np.uint8
+    assert stored['response_time'].dtype == np.float32
+    assert not stored['response_time'].to_numpy().flags.writeable  # a view of the read-only mapping
+    # student_id codes share one dictionary across tables
+    assert store.table('students')['student_id'].cat.categories.equals(stored['student_id'].cat.categories)
+    pd.testing.assert_frame_equal(as_plain(stored), as_plain(logs_df), check_dtype=False)
+
+
+def test_analyzing_a_store_matches_in_memory_analysis(tmp_path):
+    students_df, logs_df = generate_mock_data(n_students=80, bulk=True, seed=5)
+    build_store(tmp_path, students_df, logs_df)
+    store = ColumnStore(tmp_path)
+
+    expected = CognitiveAnalyzer().analyze_all(students_df, logs_df)
+    pd.testing.assert_frame_equal(as_plain(store.table('metrics')), as_plain(expected), check_dtype=False)
+    pd.testing.assert_frame_equal(as_plain(CognitiveAnalyzer().analyze_all(*store.data())), as_plain(expected), check_dtype=False)
+
+
+def test_registry_serves_precomputed_metrics_from_store(tmp_path):
+    build_store(tmp_path / "west", *generate_mock_data(n_students=40, bulk=True, seed=6))
+    registry = CohortRegistry()
+    registry.register_directory(tmp_path)
+
+    ctx = registry.get("west")
+    assert len(ctx.metrics_df) == 40
+    assert not ctx.is_built('stream')
+    assert len(ctx.table_index) == 40
+
+
+def test_narrow_columns_fit_their_range(tmp_path):
+    _, logs_df = generate_mock_data()
+    logs_df.loc[0, 'session'] = 300
+    write_store(tmp_path, {'logs': logs_df})
+    stored = ColumnStore(tmp_path).table('logs')
+
+    assert stored['session'].dtype == np.uint16
+    assert stored.loc[0, 'session'] == 300
+    assert (stored['session'].to_numpy() == logs_df['session'].to_numpy()).all()
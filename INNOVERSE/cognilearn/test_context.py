@@ -0,0 +1,87 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+from context import SNAPSHOT_ARTIFACTS, DataContext
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Cold start = wall time to import app.py in a fresh interpreter. Importing used to run
+# the whole pipeline (about 2s here); override the target on slower machines.
+COLD_START_TARGET_SECONDS = float(os.environ.get("COGNILEARN_COLD_START_TARGET", "2.0"))
+
+
+def test_import_app_is_lazy_and_within_cold_start_target():
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import app\n"
+        "print(json.dumps({'seconds': time.perf_counter() - start,\n"
+        "                  'built': app.registry.resident(),\n"
+        "                  'disk_cache': app.registry.result_cache is not None,\n"
+        "                  'sklearn': 'sklearn' in sys.modules,\n"
+        "                  'plotly_express': 'plotly.express' in sys.modules}))\n"
+    )
+    env = {k: v for k, v in os.environ.items() if k != "COGNILEARN_CACHE_DIR"}
+    out = subprocess.run([sys.executable, "-c", script], cwd=HERE, env=env, capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+
+    assert result['built'] == []
+    assert not result['disk_cache']
+    assert not result['sklearn']
+    assert not result['plotly_express']
+    assert result['seconds'] < COLD_START_TARGET_SECONDS, result
+
+
+def test_warm_up_builds_every_artifact_in_background():
+    ctx = DataContext()
+    ctx.warm_up().join()
+
+    for name in ('metrics_df', 'recs_df', 'report_data', 'aggregates'):
+        assert ctx.is_built(name)
+    assert len(ctx.metrics_df) == 50
+
+
+def test_refresh_folds_events_in_and_rebuilds_derived_artifacts():
+    ctx = DataContext()
+    aggregates = ctx.aggregates
+    n_logs = len(ctx.logs_df)
+
+    event = ctx.logs_df.iloc[0].to_dict()
+    ctx.event_queue.put(event)
+    assert ctx.refresh()
+
+    assert len(ctx.logs_df) == n_logs + 1
+    assert ctx.version == 1
+    assert ctx.aggregates is not aggregates
+    assert ctx.aggregates.version == 1
+    assert not ctx.refresh()
+
+
+def test_background_refresh_swaps_in_complete_snapshots():
+    ctx = DataContext()
+    ctx.warm_up(background=False)
+    old = ctx.snapshot
+    old_metrics = old.metrics_df.copy()
+
+    ctx.start_background_refresh(interval=60)
+    try:
+        ctx.event_queue.put(ctx.logs_df.iloc[0].to_dict())
+        assert not ctx.request_refresh()  # only wakes the worker
+        deadline = time.time() + 30
+        while ctx.published_snapshot.version == 0 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        ctx.stop_background_refresh()
+
+    new = ctx.snapshot
+    assert new.version == 1 and new.build_seconds > 0
+    assert all(new.is_built(name) for name in SNAPSHOT_ARTIFACTS)
+    assert len(new.logs_df) == len(old.logs_df) + 1
+    # Callbacks still holding the old snapshot keep a consistent view of version 0
+    assert old.version == 0 and old.aggregates.version == 0
+    pd.testing.assert_frame_equal(old.metrics_df, old_metrics)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_generator import generate_bulk_data, generate_mock_data, iter_mock_data, write_mock_data
+
+
+def test_bulk_mode_is_seeded_and_typed():
+    students_df, logs_df = generate_mock_data(n_students=200, n_sessions=12, bulk=True, seed=7)
+    again_students, again_logs = generate_mock_data(n_students=200, n_sessions=12, bulk=True, seed=7)
+
+    pd.testing.assert_frame_equal(students_df, again_students)
+    pd.testing.assert_frame_equal(logs_df, again_logs)
+
+    assert len(students_df) == 200
+    assert logs_df['student_id'].dtype == 'category'
+    assert logs_df['subject'].dtype == 'category'
+    assert logs_df['session'].dtype == np.int8
+    assert logs_df['response_time'].dtype == np.float32
+    assert set(logs_df['session'].unique()) == set(range(1, 13))
+
+
+def test_bulk_mode_follows_archetype_logic():
+    students_df, logs_df = generate_mock_data(n_students=2000, n_sessions=20, bulk=True, seed=3)
+    per_session = logs_df.groupby(['student_id', 'session'], observed=True).size()
+    assert per_session.between(8, 15).all()
+
+    logs = logs_df.merge(students_df[['student_id', 'base_archetype']], on='student_id')
+    mean_time = logs.groupby('base_archetype', observed=True)['response_time'].mean()
+    assert mean_time['Analytical Thinker'] > mean_time['Mixed Learner'] > mean_time['Kinesthetic Learner']
+
+    assert (logs_df['response_time'] >= 5.0).all()
+    assert (logs_df.loc[logs_df['correct'] == 1, 'score'] == 10).all()
+    early = logs_df.loc[logs_df['session'] <= 3, 'correct'].mean()
+    late = logs_df.loc[logs_df['session'] >= 18, 'correct'].mean()
+    assert late > early
+
+
+def test_default_call_keeps_legacy_cohort():
+    students_df, logs_df = generate_mock_data()
+    assert len(students_df) == 50
+    assert students_df['name'].iloc[0] == 'Emma'
+    assert logs_df['session'].max() == 20
+
+
+def test_chunked_output_matches_bulk_output():
+    chunks = list(iter_mock_data(n_students=250, n_sessions=6, seed=11, block_size=100))
+    assert [len(s) for s, _ in chunks] == [100, 100, 50]
+
+    students_df, logs_df = generate_bulk_data(n_students=250, n_sessions=6, seed=11, block_size=100)
+    chunked_students = pd.concat([s for s, _ in chunks], ignore_index=True)
+    chunked_logs = pd.concat([l for _, l in chunks], ignore_index=True)
+
+    # Per-chunk categories differ, so compare values rather than category sets
+    pd.testing.assert_frame_equal(chunked_students, students_df, check_dtype=False, check_categorical=False)
+    pd.testing.assert_frame_equal(chunked_logs, logs_df, check_dtype=False, check_categorical=False)
+
+
+def test_write_mock_data_streams_part_files(tmp_path):
+    paths = write_mock_data(tmp_path, fmt="csv", n_students=30, n_sessions=4, seed=5, block_size=10)
+    assert len(paths) == 6
+
+    logs_df = pd.concat([pd.read_csv(p) for p in sorted(paths) if '/logs/' in p], ignore_index=True)
+    _, expected = generate_bulk_data(n_students=30, n_sessions=4, seed=5, block_size=10)
+    assert len(logs_df) == len(expected)
+    assert (logs_df['student_id'] == expected['student_id'].astype(str)).all()
+    np.testing.assert_allclose(logs_df['response_time'], expected['response_time'], rtol=1e-6)
+
+
+def test_bulk_mode_rejects_empty_cohorts():
+    with pytest.raises(ValueError, match="n_students"):
+        generate_bulk_data(n_students=0)
+
+
+def test_bulk_sessions_widen_past_one_byte():
+    _, logs_df = generate_bulk_data(n_students=3, n_sessions=200, seed=2)
+    assert logs_df['session'].dtype == np.int16
+    assert logs_df['session'].min() == 1 and logs_df['session'].max() == 200
+
+
+def test_write_mock_data_defaults_to_csv(tmp_path):
+    paths = write_mock_data(tmp_path, n_students=5, n_sessions=2)
+    assert paths and all(p.endswith(".csv") for p in paths)
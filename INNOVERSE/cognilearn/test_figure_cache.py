@@ -0,0 +1,40 @@
+import plotly.graph_objects as go
+
+from figure_cache import FigureCache
+
+
+def _builder(calls):
+    def build():
+        calls.append(1)
+        return go.Figure(go.Bar(x=[1, 2, 3], y=[4, 5, 6]))
+    return build
+
+
+def test_hits_skip_rebuilding_until_version_changes():
+    cache = FigureCache()
+    calls = []
+
+    first = cache.get("bars", _builder(calls), version=1)
+    second = cache.get("bars", _builder(calls), version=1)
+    # A hit hands back the stored dict itself, without decoding it again
+    assert first is second and isinstance(first, dict)
+    assert len(calls) == 1
+
+    cache.get("bars", _builder(calls), student_id="STU001", version=1)
+    cache.get("bars", _builder(calls), version=2)
+    assert len(calls) == 3
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 3
+
+
+def test_lru_eviction_respects_entry_cap():
+    cache = FigureCache(max_entries=2)
+    calls = []
+    for name in ["a", "b", "a", "c", "a", "b"]:
+        cache.get(name, _builder(calls))
+
+    # "b" was least recently used when "c" arrived, so it had to be rebuilt
+    assert len(calls) == 4
+    stats = cache.stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 2
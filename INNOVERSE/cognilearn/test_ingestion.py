@@ -0,0 +1,109 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_generator import generate_mock_data
+from ingestion import MAX_SESSION, DataValidationError, ingest_log_csv
+
+
+def as_csv(frame):
+    return io.StringIO(frame.to_csv(index=False))
+
+
+def test_invalid_rows_are_dropped_and_counted():
+    students_df, logs_df = generate_mock_data(n_students=10)
+    logs_df = logs_df.merge(students_df[['student_id', 'name', 'grade']], on='student_id')
+    logs_df.loc[0, 'correct'] = 2
+    logs_df.loc[1, 'retried'] = -1
+    logs_df.loc[2, 'session'] = 0
+    logs_df.loc[3, 'student_id'] = None
+    logs_df.loc[[4, 5], 'response_time'] = [np.nan, -3.0]
+
+    students, logs, meta = ingest_log_csv(as_csv(logs_df), chunk_rows=500)
+
+    assert meta['rows_read'] == len(logs_df)
+    assert meta['rows_dropped'] == 4
+    assert meta['dropped_by_reason'] == {
+        'invalid_correct': 1, 'invalid_retried': 1, 'invalid_session': 1, 'missing_student_id': 1
+    }
+    assert meta['response_time_imputed'] == 2
+    # Rows 4 and 5 are the first two kept; both get the median of the valid times
+    median = np.median(logs_df.loc[6:, 'response_time'].to_numpy(dtype=np.float32))
+    assert (logs['response_time'].iloc[:2] == median).all()
+    assert len(logs) == len(logs_df) - 4
+    assert list(students['name']) == list(students_df['name'])
+
+
+def test_date_like_sessions_are_dropped():
+    _, logs_df = generate_mock_data(n_students=5)
+    logs_df.loc[0, 'session'] = 20250115
+    logs_df.loc[1, 'session'] = MAX_SESSION
+    _, logs, meta = ingest_log_csv(as_csv(logs_df))
+
+    assert meta['dropped_by_reason'] == {'invalid_session': 1}
+    assert logs['session'].max() == MAX_SESSION
+
+
+def test_chunked_parse_matches_single_pass_in_compact_schema():
+    _, logs_df = generate_mock_data(n_students=15)
+    _, whole, _ = ingest_log_csv(as_csv(logs_df))
+    _, chunked, _ = ingest_log_csv(as_csv(logs_df), chunk_rows=257)
+
+    assert isinstance(chunked['student_id'].dtype, pd.CategoricalDtype)
+    assert chunked['correct'].dtype == bool
+    assert chunked['session'].dtype == np.int8
+    pd.testing.assert_frame_equal(chunked.astype({'student_id': str, 'subject': str}),
+                                  whole.astype({'student_id': str, 'subject': str}))
+
+
+def test_unusable_files_raise_data_validation_error():
+    with pytest.raises(DataValidationError, match="Missing required columns"):
+        ingest_log_csv(io.StringIO("student_id,session\nS1,1\n"))
+    header = "student_id,session,subject,response_time,correct,retried,score\n"
+    with pytest.raises(DataValidationError, match="Could not parse"):
+        ingest_log_csv(io.StringIO(header + "S1,one,Algebra,10,1,0,10\n"))
+    with pytest.raises(DataValidationError, match="No valid rows"):
+        ingest_log_csv(io.StringIO(header + "S1,1,Algebra,10,7,0,10\n"))
+
+
+def upload(app, frame, filename):
+    import base64
+    contents = "data:text/csv;base64," + base64.b64encode(frame.to_csv(index=False).encode()).decode()
+    return app.ingest_upload(contents, filename, app.DEFAULT_COHORT)
+
+
+def test_reuploading_a_file_replaces_its_cohort(tmp_path, monkeypatch):
+    import app
+    from columnar_store import ColumnStore
+    monkeypatch.setattr(app, "UPLOAD_DIR", str(tmp_path))
+    _, logs_df = generate_mock_data(n_students=10)
+
+    try:
+        upload(app, logs_df.head(10), "class-7b.csv")
+        first = app._uploads["class-7b"]
+        assert ColumnStore.is_store(first)
+        assert len(app.registry.get("class-7b").logs_df) == 10
+        upload(app, logs_df.head(25), "class-7b.csv")
+        assert len(app.registry.get("class-7b").logs_df) == 25
+        assert not ColumnStore.is_store(first)
+
+        # An evicted upload is re-read from its store
+        app.registry.evict("class-7b")
+        assert len(app.registry.get("class-7b").logs_df) == 25
+    finally:
+        app.registry.unregister("class-7b")
+        app._uploads.pop("class-7b", None)
+
+
+def test_uploads_cannot_replace_existing_cohorts(tmp_path, monkeypatch):
+    import app
+    monkeypatch.setattr(app, "UPLOAD_DIR", str(tmp_path))
+    _, logs_df = generate_mock_data(n_students=10)
+    loader = app.registry.loaders[app.DEFAULT_COHORT]
+
+    options, cohort, status = upload(app, logs_df.head(10), app.DEFAULT_COHORT + ".csv")
+    assert "already exists" in status and cohort == app.DEFAULT_COHORT
+    assert app.registry.loaders[app.DEFAULT_COHORT] is loader
+    assert not list(tmp_path.iterdir())
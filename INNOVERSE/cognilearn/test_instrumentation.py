@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+from instrumentation import Metrics
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_timed_calls_fill_histograms_and_count_errors():
+    metrics = Metrics(prefix="t")
+
+    @metrics.timed("work")
+    def work(fail=False):
+        if fail:
+            raise ValueError("boom")
+        return 42
+
+    assert work() == 42
+    with pytest.raises(ValueError):
+        work(fail=True)
+    metrics.observe("work", 2.0)
+
+    text = metrics.render()
+    assert 't_call_seconds_count{name="work"} 3' in text
+    assert 't_call_seconds_bucket{name="work",le="0.001"} 2' in text
+    assert 't_call_seconds_bucket{name="work",le="+Inf"} 3' in text
+    assert 't_call_errors_total{name="work"} 1' in text
+
+
+def test_collectors_are_rendered_as_gauges():
+    metrics = Metrics(prefix="t")
+    metrics.register_collector(lambda: [("cache_hit_ratio", "gauge", "Hit ratio.", {'cohort': 'a "b"'}, 0.5)])
+
+    text = metrics.render()
+    assert "# TYPE t_cache_hit_ratio gauge" in text
+    assert 't_cache_hit_ratio{cohort="a \\"b\\""} 0.5' in text
+
+
+def test_profiling_keeps_folded_stacks_of_slow_calls_only():
+    metrics = Metrics(prefix="t", profile_slow_seconds=0.05)
+
+    with metrics.timer("fast"):
+        pass
+    with metrics.timer("slow"):
+        busy_wait(0.1)
+
+    assert [p['name'] for p in metrics.profiles] == ["slow"]
+    assert "busy_wait" in metrics.profiles[0]['folded']
+    metrics.disable_profiling()
+    with metrics.timer("slow"):
+        busy_wait(0.06)
+    assert len(metrics.profiles) == 1
+
+
+def test_toggling_profiling_during_a_call_is_safe():
+    metrics = Metrics(prefix="t", profile_slow_seconds=0.0)
+    with metrics.timer("x"):
+        metrics.disable_profiling()
+    assert [p['name'] for p in metrics.profiles] == ["x"]
+
+    with metrics.timer("y"):
+        metrics.enable_profiling(0.0)
+    assert len(metrics.profiles) == 1
+
+
+def test_metrics_route_serves_prometheus_text():
+    import app
+    app.render_content("tab-1")
+    app.render_content("tab-1")
+
+    response = app.app.server.test_client().get("/metrics")
+    text = response.data.decode()
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert 'cognilearn_call_seconds_count{name="render_content"}' in text
+    assert 'cognilearn_figure_cache_hit_ratio{cohort="Demo School"}' in text
+    assert 'cognilearn_snapshot_version{cohort="Demo School"} 0' in text
+
+
+def test_profiles_route_is_read_only():
+    import app
+    client = app.app.server.test_client()
+    assert client.post("/profiles", data={'slow_ms': '0'}).status_code == 405
+    assert app.metrics.profile_slow_seconds is None
+    assert client.get("/profiles").status_code == 200
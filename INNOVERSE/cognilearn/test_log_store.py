@@ -0,0 +1,27 @@
+import pandas as pd
+
+from data_generator import generate_mock_data
+from log_store import StudentLogStore
+
+
+def test_get_returns_each_students_rows_in_order():
+    _, logs_df = generate_mock_data()
+    shuffled = logs_df.sample(frac=1.0, random_state=4)
+    store = StudentLogStore(shuffled)
+
+    assert len(store) == logs_df['student_id'].nunique()
+    for sid in ['STU001', 'STU025', 'STU050']:
+        expected = shuffled[shuffled['student_id'] == sid].reset_index(drop=True)
+        pd.testing.assert_frame_equal(store.get(sid).reset_index(drop=True), expected)
+
+
+def test_unknown_student_and_export(tmp_path):
+    _, logs_df = generate_mock_data(bulk=True, n_students=20)
+    store = StudentLogStore(logs_df)
+
+    assert 'STU999' not in store
+    assert len(store.get('STU999')) == 0
+
+    path = tmp_path / "stu003.csv"
+    store.export_student('STU003', path)
+    assert len(pd.read_csv(path)) == (logs_df['student_id'] == 'STU003').sum()
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from analyzer import CognitiveAnalyzer
+from data_generator import generate_mock_data
+from recommender import RecommendationEngine
+
+
+def get_all_recommendations_iterative(engine, students_df):
+    # Reference per-student loop that get_all_recommendations must match
+    recs = []
+    for _, student in students_df.iterrows():
+        priority = engine.get_priority(student)
+        recs.append({
+            "Student": student['name'],
+            "Pattern": student['pattern'],
+            "Accuracy%": f"{student['accuracy']*100:.1f}%",
+            "Retry Rate%": f"{student['retry_rate']*100:.1f}%",
+            "Priority": priority,
+            "Top Recommendation": engine.get_recommendation(student)
+        })
+
+    df = pd.DataFrame(recs)
+
+    # Sort by priority: Critical -> Moderate -> On Track
+    priority_map = {"🔴 Critical": 0, "🟡 Moderate": 1, "🟢 On Track": 2}
+    df['sort_key'] = df['Priority'].map(priority_map)
+    df = df.sort_values('sort_key').drop('sort_key', axis=1)
+
+    return df
+
+
+def test_bulk_recommendations_match_iterative_loop():
+    students_df, logs_df = generate_mock_data()
+    metrics_df = CognitiveAnalyzer().analyze_all(students_df, logs_df)
+    engine = RecommendationEngine()
+
+    pd.testing.assert_frame_equal(
+        engine.get_all_recommendations(metrics_df),
+        get_all_recommendations_iterative(engine, metrics_df)
+    )
+
+
+def test_bulk_recommendations_cover_band_edges_and_unknown_patterns():
+    rng = np.random.default_rng(0)
+    n = 500
+    metrics_df = pd.DataFrame({
+        'name': [f"S{i}" for i in range(n)],
+        'pattern': rng.choice(["Visual Learner", "Analytical Thinker", "Mystery Pattern"], n),
+        'accuracy': np.concatenate([[0.6, 0.72, 0.5999, 0.7199], rng.random(n - 4)]),
+        'retry_rate': rng.random(n)
+    })
+    engine = RecommendationEngine()
+
+    pd.testing.assert_frame_equal(
+        engine.get_all_recommendations(metrics_df),
+        get_all_recommendations_iterative(engine, metrics_df)
+    )
+
+    # Single lookups still go through the per-student methods
+    assert engine.get_priority({'accuracy': 0.6}) == "🟡 Moderate"
+    assert engine.get_recommendation({'pattern': 'Mystery Pattern', 'accuracy': 0.9, 'retry_rate': 0.9}) == \
+        engine.strategies["Mixed Learner"][1]
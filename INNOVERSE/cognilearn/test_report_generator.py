@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from analyzer import CognitiveAnalyzer
+from context import DataContext
+from data_generator import generate_mock_data
+from report_generator import ReportAccumulator, generate_report_data
+
+
+def assert_same_report(report, expected):
+    got, want = report['summary'], expected['summary']
+    assert got['total_sessions'] == want['total_sessions']
+    assert got['avg_improvement'] == pytest.approx(want['avg_improvement'], rel=1e-12)
+    assert got['at_risk_count'] == want['at_risk_count']
+    assert got['top_performer'] == want['top_performer']
+
+
+def test_accumulator_matches_full_report_across_chunks():
+    students_df, logs_df = generate_mock_data(n_students=60, bulk=True, seed=7)
+    metrics_df = CognitiveAnalyzer().analyze_all(students_df, logs_df)
+
+    accumulator = ReportAccumulator()
+    for chunk in np.array_split(np.arange(len(logs_df)), 7):
+        accumulator.add_logs(logs_df.iloc[chunk])
+    accumulator.update_metrics(metrics_df)
+
+    report = accumulator.report_data()
+    expected = generate_report_data(students_df, logs_df, metrics_df)
+    assert_same_report(report, expected)
+    assert report['insights'][2] == expected['insights'][2]
+
+
+def test_changed_metrics_move_top_performer_and_at_risk_count():
+    students_df, logs_df = generate_mock_data(n_students=30, bulk=True, seed=8)
+    metrics_df = CognitiveAnalyzer().analyze_all(students_df, logs_df)
+    accumulator = ReportAccumulator()
+    accumulator.add_logs(logs_df)
+    accumulator.update_metrics(metrics_df)
+
+    # The weakest student becomes the strongest; the strongest falls below the threshold
+    weakest, strongest = metrics_df['accuracy'].idxmin(), metrics_df['accuracy'].idxmax()
+    changed = metrics_df.copy()
+    changed.loc[weakest, 'accuracy'] = 0.99
+    changed.loc[strongest, 'accuracy'] = 0.1
+    accumulator.pending.update(changed.loc[[weakest, strongest], 'student_id'])
+    accumulator.update_metrics(changed)
+
+    assert_same_report(accumulator.report_data(), generate_report_data(students_df, logs_df, changed))
+
+
+def test_context_report_follows_refresh():
+    ctx = DataContext(loader=lambda: generate_mock_data(n_students=20, bulk=True, seed=9))
+    ctx.report_data
+    for session, score in [(1, 0), (20, 10), (20, 10)]:
+        ctx.event_queue.put({'student_id': 'STU001', 'session': session, 'subject': 'Algebra',
+                             'response_time': 20.0, 'correct': score // 10, 'retried': 0, 'score': score})
+    ctx.refresh()
+
+    assert ctx.is_built('report_accumulator') and ctx.published_snapshot.version == 0
+    assert_same_report(ctx.report_data, generate_report_data(ctx.students_df, ctx.logs_df, ctx.metrics_df))
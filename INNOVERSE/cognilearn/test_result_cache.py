@@ -0,0 +1,66 @@
+import shutil
+
+import pandas as pd
+
+from analyzer import CognitiveAnalyzer
+from context import DataContext
+from data_generator import generate_mock_data
+import result_cache
+from result_cache import CODE_FILES, ResultCache, code_version, fingerprint
+from schema import compact_data
+
+
+def test_fingerprint_follows_data_and_profiles():
+    students_df, logs_df = compact_data(generate_mock_data(n_students=30, bulk=True, seed=3))
+    analyzer = CognitiveAnalyzer()
+    key = fingerprint(students_df, logs_df, analyzer)
+    assert fingerprint(students_df.copy(), logs_df.copy(), CognitiveAnalyzer()) == key
+
+    changed = logs_df.copy()
+    changed.loc[5, 'response_time'] += 1
+    assert fingerprint(students_df, changed, analyzer) != key
+    analyzer.profiles["Mixed Learner"] = analyzer.profiles["Mixed Learner"] + 0.1
+    assert fingerprint(students_df, logs_df, analyzer) != key
+
+
+def test_code_version_covers_the_snapshot_path(tmp_path, monkeypatch):
+    for name in CODE_FILES:
+        shutil.copy(name, tmp_path / name)
+    monkeypatch.setattr(result_cache, "HERE", str(tmp_path))
+    before = code_version()
+    for name in ('streaming.py', 'context.py', 'columnar_store.py'):
+        with open(tmp_path / name, "a") as f:
+            f.write("\n# changed\n")
+        assert code_version() != before
+        before = code_version()
+
+
+def test_entries_round_trip_and_are_pruned(tmp_path):
+    ctx = DataContext()
+    cache = ResultCache(str(tmp_path), max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.store(key, ctx.metrics_df, ctx.recs_df, ctx.report_data)
+
+    metrics_df, recs_df, report_data = cache.load("c")
+    pd.testing.assert_frame_equal(metrics_df, ctx.metrics_df)
+    pd.testing.assert_frame_equal(recs_df, ctx.recs_df)
+    assert report_data == ctx.report_data
+    assert sorted(cache.entries()) == ["b", "c"]
+    assert cache.load("a") is None
+
+
+def test_context_reuses_results_across_restarts(tmp_path):
+    loader = lambda: generate_mock_data(n_students=40, bulk=True, seed=4)
+    first = DataContext(loader, result_cache=ResultCache(str(tmp_path)))
+    first.warm_up(background=False)
+
+    cache = ResultCache(str(tmp_path))
+    second = DataContext(loader, result_cache=cache)
+    pd.testing.assert_frame_equal(second.recs_df, first.recs_df)
+    assert second.report_data == first.report_data
+    assert cache.hits == 1 and not second.is_built('stream')
+
+    # Streamed updates are computed as usual
+    second.event_queue.put(second.logs_df.iloc[0].to_dict())
+    assert second.refresh()
+    assert second.snapshot.version == 1 and second.is_built('stream')
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from analyzer import CognitiveAnalyzer
+from data_generator import generate_mock_data
+from recommender import RecommendationEngine
+from report_generator import generate_report_data
+from schema import append_logs, compact_data, compact_logs, memory_report
+
+
+def test_compact_logs_use_narrow_types_and_far_less_memory():
+    _, logs_df = generate_mock_data(n_students=20)
+    compact = compact_logs(logs_df)
+
+    assert isinstance(compact['student_id'].dtype, pd.CategoricalDtype)
+    assert compact['correct'].dtype == bool
+    assert compact['session'].dtype == np.int8
+    assert compact['response_time'].dtype == np.float32
+    report = memory_report(logs_df, compact)
+    assert report.loc['total', 'ratio'] > 5
+    assert report.loc['total', 'after_per_row'] < 16
+
+
+def test_pipeline_on_compact_frames_matches_raw_frames():
+    raw_students, raw_logs = generate_mock_data(n_students=40)
+    students_df, logs_df = compact_data((raw_students, raw_logs))
+    analyzer = CognitiveAnalyzer()
+
+    expected = analyzer.analyze_all(raw_students, raw_logs)
+    metrics_df = analyzer.analyze_all(students_df, logs_df)
+    # Only response_time loses precision (float32), far below anything the dashboard shows
+    assert (metrics_df['pattern'] == expected['pattern']).all()
+    np.testing.assert_allclose(metrics_df['avg_response_time'], expected['avg_response_time'], rtol=1e-6)
+    np.testing.assert_array_equal(metrics_df['accuracy'], expected['accuracy'])
+
+    recs = RecommendationEngine().get_all_recommendations(metrics_df)
+    pd.testing.assert_frame_equal(recs, RecommendationEngine().get_all_recommendations(expected))
+    assert generate_report_data(students_df, logs_df, metrics_df) == generate_report_data(raw_students, raw_logs, expected)
+
+
+def test_append_logs_keeps_the_compact_schema():
+    _, logs_df = compact_data(generate_mock_data(n_students=5))
+    new_logs = pd.DataFrame([
+        {'student_id': 'STU099', 'session': 21, 'subject': 'Physics', 'response_time': 30.0,
+         'correct': 1, 'retried': 0, 'score': 10}
+    ])
+    combined = append_logs(logs_df, new_logs)
+
+    assert len(combined) == len(logs_df) + 1
+    assert combined['session'].dtype == np.int8
+    assert isinstance(combined['subject'].dtype, pd.CategoricalDtype)
+    assert combined['subject'].iloc[-1] == 'Physics'
+    assert combined['correct'].dtype == bool
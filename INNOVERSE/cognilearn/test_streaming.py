@@ -0,0 +1,74 @@
+import queue
+import threading
+import time
+
+import pandas as pd
+
+from analyzer import CognitiveAnalyzer
+from data_generator import generate_mock_data
+from streaming import StreamingAnalyzer, tail_csv
+
+
+def _split(logs_df, n_initial):
+    shuffled = logs_df.sample(frac=1.0, random_state=0).reset_index(drop=True)
+    return shuffled.iloc[:n_initial], shuffled.iloc[n_initial:]
+
+
+def test_streamed_events_match_full_analysis():
+    students_df, logs_df = generate_mock_data()
+    analyzer = CognitiveAnalyzer()
+    initial, rest = _split(logs_df, 8000)
+
+    stream = StreamingAnalyzer(analyzer, students_df, initial)
+    stream.metrics_df()
+    for i, event in enumerate(rest.to_dict('records')):
+        stream.ingest_event(event)
+        if i % 1500 == 0:
+            stream.metrics_df()
+
+    expected = analyzer.analyze_all(students_df, logs_df)
+    pd.testing.assert_frame_equal(stream.metrics_df(), expected)
+
+
+def test_micro_batches_only_touch_changed_students():
+    students_df, logs_df = generate_mock_data()
+    analyzer = CognitiveAnalyzer()
+    stream = StreamingAnalyzer(analyzer, students_df, logs_df)
+    before = stream.metrics_df()
+
+    # One student gets a perfect late session; nobody else's raw metrics move
+    extra = logs_df[(logs_df['student_id'] == 'STU010') & (logs_df['session'] == 20)].assign(correct=1, retried=0, score=10)
+    stream.ingest_batch(extra)
+    after = stream.metrics_df()
+
+    changed = (before['accuracy'] != after['accuracy'])
+    assert list(after.loc[changed, 'student_id']) == ['STU010']
+    expected = analyzer.analyze_all(students_df, pd.concat([logs_df, extra], ignore_index=True))
+    pd.testing.assert_frame_equal(after, expected)
+
+
+def test_drain_queue_and_tail_csv(tmp_path):
+    students_df, logs_df = generate_mock_data()
+    analyzer = CognitiveAnalyzer()
+    initial, rest = _split(logs_df, 9000)
+    stream = StreamingAnalyzer(analyzer, students_df, initial)
+
+    path = tmp_path / "events.csv"
+    rest.iloc[:0].to_csv(path, index=False)
+    events = queue.Queue()
+    stop = threading.Event()
+    tailer = threading.Thread(target=tail_csv, args=(str(path), events, stop, 0.01), daemon=True)
+    tailer.start()
+    rest.to_csv(path, mode='a', header=False, index=False)
+
+    drained = 0
+    deadline = time.time() + 10
+    while drained < len(rest) and time.time() < deadline:
+        drained += len(stream.drain(events))
+        time.sleep(0.01)
+    stop.set()
+    tailer.join(timeout=5)
+
+    assert drained == len(rest)
+    expected = analyzer.analyze_all(students_df, logs_df)
+    pd.testing.assert_frame_equal(stream.metrics_df(), expected, check_exact=False)
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from student_search import StudentSearchIndex
+
+
+def make_metrics():
+    return pd.DataFrame({
+        'student_id': ['STU001', 'STU002', 'STU003', 'STU004', 'STU005'],
+        'name': ['Emma', 'Emily 2', 'Liam', 'Noemi', 'Emma 2'],
+        'pattern': ['Visual Learner', 'Mixed Learner', 'Visual Learner', 'Analytical Thinker', 'Mixed Learner']
+    })
+
+
+def test_prefix_matches_any_word_and_all_query_words():
+    index = StudentSearchIndex(make_metrics(), limit=10)
+
+    assert [o['value'] for o in index.options("em")] == ['STU001', 'STU002', 'STU005', 'STU004']
+    assert [o['value'] for o in index.options("emma mix")] == ['STU005']
+    assert [o['value'] for o in index.options("stu003")] == ['STU003']
+    assert index.options("vis")[0] == {'label': 'Emma (Visual Learner)', 'value': 'STU001'}
+
+
+def test_substring_matches_fill_up_after_prefix_matches():
+    index = StudentSearchIndex(make_metrics(), limit=10)
+    # "mi" starts "Mixed" (2 students) and is inside "Emily" and "Noemi"
+    assert [o['value'] for o in index.options("mi")] == ['STU002', 'STU005', 'STU004']
+    assert index.options("zzz") == []
+
+
+def test_results_are_capped_and_keep_the_selected_student():
+    index = StudentSearchIndex(make_metrics(), limit=2)
+
+    assert len(index.options("")) == 2
+    assert len(index.options("learner")) == 2
+    options = index.options("liam", selected='STU004')
+    assert [o['value'] for o in options] == ['STU004', 'STU003']
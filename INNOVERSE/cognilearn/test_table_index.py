@@ -0,0 +1,81 @@
+import pandas as pd
+
+from analyzer import CognitiveAnalyzer
+from data_generator import generate_mock_data
+from recommender import RecommendationEngine
+from table_index import PriorityTableIndex, split_filter_part
+
+
+def _index(n_students=50, bulk=False):
+    students_df, logs_df = generate_mock_data(n_students=n_students, bulk=bulk)
+    metrics_df = CognitiveAnalyzer().analyze_all(students_df, logs_df)
+    recs_df = RecommendationEngine().get_all_recommendations(metrics_df)
+    return recs_df, metrics_df, PriorityTableIndex(recs_df, metrics_df)
+
+
+def test_pages_follow_priority_order_by_default():
+    recs_df, _, index = _index()
+    rows, page_count = index.page(1, 10)
+
+    assert page_count == 5
+    assert rows == recs_df.iloc[10:20].to_dict('records')
+
+
+def test_sorting_by_accuracy_uses_numeric_values():
+    recs_df, metrics_df, index = _index()
+    rows, _ = index.page(0, 50, sort_by=[{'column_id': 'Accuracy%', 'direction': 'desc'}])
+
+    best = metrics_df['accuracy'].idxmax()
+    assert rows[0]['Student'] == metrics_df.loc[best, 'name']
+    values = [float(r['Accuracy%'].rstrip('%')) for r in rows]
+    assert values == sorted(values, reverse=True)
+
+
+def test_filters_combine_and_page_count_shrinks():
+    recs_df, _, index = _index(n_students=3000, bulk=True)
+    query = '{Priority} = "🔴 Critical" && {Pattern} scontains Learner && {Accuracy%} s< 58'
+    rows, page_count = index.page(0, 25, filter_query=query)
+
+    accuracy = recs_df['Accuracy%'].str.rstrip('%').astype(float)
+    expected = recs_df[(recs_df['Priority'] == "🔴 Critical") & recs_df['Pattern'].str.contains('Learner') & (accuracy < 58)]
+    assert page_count == max(1, -(-len(expected) // 25))
+    assert [r['Student'] for r in rows] == list(expected['Student'].iloc[:25])
+
+
+def test_split_filter_part():
+    assert split_filter_part('{Pattern} scontains Visual') == ('Pattern', 'contains', 'Visual', False)
+    assert split_filter_part('{Accuracy%} >= 55') == ('Accuracy%', '>=', 55.0, False)
+    assert split_filter_part('{Student} ieq "Emma"') == ('Student', '=', 'Emma', True)
+    assert split_filter_part('nonsense') == (None, None, None, False)
+
+
+def test_text_filters_on_percent_columns_match_the_displayed_value():
+    recs_df, _, index = _index()
+    value = recs_df['Accuracy%'].iloc[0]
+    digits = value.split('.')[0]
+    rows, _ = index.page(0, 50, filter_query=f'{{Accuracy%}} contains {digits}')
+    assert rows and all(digits in r['Accuracy%'] for r in rows)
+    rows, _ = index.page(0, 50, filter_query=f'{{Retry Rate%}} scontains {digits}')
+    assert all(digits in r['Retry Rate%'] for r in rows)
+
+
+def test_i_operators_ignore_case():
+    recs_df, _, index = _index()
+    name = recs_df['Student'].iloc[0]
+    expected = int((recs_df['Student'] == name).sum())
+    assert len(index.page(0, 50, filter_query=f'{{Student}} ieq "{name.upper()}"')[0]) == expected
+    assert len(index.page(0, 50, filter_query=f'{{Student}} seq "{name.upper()}"')[0]) == 0
+    rows, _ = index.page(0, 50, filter_query='{Pattern} icontains visual')
+    assert rows and all('Visual' in r['Pattern'] for r in rows)
+
+
+def test_view_cache_survives_concurrent_callbacks():
+    from concurrent.futures import ThreadPoolExecutor
+    recs_df, metrics_df, _ = _index()
+    index = PriorityTableIndex(recs_df, metrics_df, max_cached_views=4)
+    queries = [f"{{Accuracy%}} > {n}" for n in range(40)] * 5
+
+    with ThreadPoolExecutor(8) as pool:
+        views = list(pool.map(lambda q: index.view(None, q), queries))
+    assert len(index._views) == 4
+    assert all(len(v) == len(index.view(None, q)) for v, q in zip(views, queries))
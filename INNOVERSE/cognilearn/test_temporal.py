@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from aggregates import AggregateCache
+from analyzer import CognitiveAnalyzer
+from data_generator import generate_mock_data
+from schema import compact_data
+from temporal import TEMPORAL_COLUMNS, session_grid, temporal_features
+
+
+def test_features_match_per_student_fits():
+    students_df, logs_df = compact_data(generate_mock_data(n_students=30, bulk=True, seed=5))
+    features = temporal_features(logs_df, window=3).set_index('student_id')
+
+    for sid in ['STU001', 'STU017', 'STU030']:
+        s_logs = logs_df[logs_df['student_id'] == sid]
+        row = features.loc[sid]
+        assert np.isclose(row['learning_slope'], np.polyfit(s_logs['session'], s_logs['correct'].astype(float), 1)[0])
+        assert np.isclose(row['response_time_decay'], -np.polyfit(s_logs['session'], np.log(s_logs['response_time']), 1)[0])
+
+        per_session = s_logs.groupby('session')['correct'].agg(['sum', 'size'])
+        windows = per_session.rolling(3).sum().dropna()
+        rolling = windows['sum'] / windows['size']
+        assert np.isclose(row['recent_accuracy'], rolling.iloc[-1])
+        assert np.isclose(row['peak_accuracy'], rolling.max())
+
+
+def test_forgetting_flags_a_fall_from_the_best_window():
+    rows = []
+    for session in range(1, 11):
+        # STU1 masters the material then slips; STU2 keeps improving
+        rows += [{'student_id': 'STU1', 'session': session, 'correct': int(session <= 6), 'response_time': 20.0}] * 4
+        rows += [{'student_id': 'STU2', 'session': session, 'correct': int(session > 3), 'response_time': 30.0 / session}] * 4
+    features = temporal_features(pd.DataFrame(rows), window=3).set_index('student_id')
+
+    assert features.loc['STU1', 'forgetting'] and not features.loc['STU2', 'forgetting']
+    assert features.loc['STU1', 'forgetting_drop'] == 1.0
+    assert features.loc['STU2', 'learning_slope'] > 0 and features.loc['STU2', 'response_time_decay'] > 0
+    assert np.isclose(features.loc['STU1', 'response_time_decay'], 0)
+
+
+def test_grid_width_follows_distinct_sessions():
+    _, logs_df = generate_mock_data()
+    logs_df.loc[0, 'session'] = 20250115
+    grid = session_grid(logs_df)
+    assert grid['count'].shape == (50, logs_df['session'].nunique())
+
+    features = temporal_features(logs_df).set_index('student_id')
+    sid = logs_df.loc[0, 'student_id']
+    s_logs = logs_df[logs_df['student_id'] == sid]
+    assert np.isclose(features.loc[sid, 'learning_slope'], np.polyfit(s_logs['session'], s_logs['correct'].astype(float), 1)[0])
+
+
+def test_features_reach_the_analyzer_and_drill_down():
+    students_df, logs_df = generate_mock_data()
+    analyzer = CognitiveAnalyzer()
+    metrics_df = analyzer.analyze_all(students_df, logs_df, temporal=True)
+    assert set(TEMPORAL_COLUMNS) <= set(metrics_df.columns)
+    assert metrics_df[TEMPORAL_COLUMNS].notna().all().all()
+
+    aggregates = AggregateCache(logs_df, metrics_df)
+    curve = aggregates.student_learning_curve('STU001')
+    assert list(curve['session']) == sorted(logs_df.loc[logs_df['student_id'] == 'STU001', 'session'].unique())
+    assert np.isclose(curve['rolling_accuracy'].iloc[-1], aggregates.student_temporal('STU001')['recent_accuracy'])
+
+
+def test_learning_curve_uses_the_feature_grid():
+    rows = []
+    for session in range(1, 11):
+        rows += [{'student_id': 'STU1', 'session': session, 'correct': 1, 'response_time': 20.0}] * 2
+    # STU2 pauses after session 3 and answers wrong when it comes back
+    for session in (1, 2, 3, 9):
+        rows += [{'student_id': 'STU2', 'session': session, 'correct': int(session < 9), 'response_time': 20.0}] * 2
+    logs_df = pd.DataFrame(rows)
+    aggregates = AggregateCache(logs_df, pd.DataFrame({'student_id': ['STU1', 'STU2']}))
+
+    curve = aggregates.student_learning_curve('STU2')
+    # The last window (sessions 8-10) only covers session 9, in the chart as in the features
+    assert list(curve['session']) == [1, 2, 3, 4, 5, 9, 10]
+    assert curve['rolling_accuracy'].iloc[-1] == 0.0
+    assert aggregates.student_temporal('STU2')['recent_accuracy'] == 0.0
+    assert aggregates.student_learning_curve('STU3').empty